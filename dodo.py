@@ -19,6 +19,7 @@ poetry run doit list
 
 """
 
+from pathlib import Path
 from warnings import filterwarnings
 
 from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
@@ -27,3 +28,25 @@ from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 
 from pattern_feedback_tool.doit_tasks import *  # noqa: E402,F401,F403
+
+
+def _build_assets() -> None:
+    # Imported when the task runs, because loading the game package needs a display
+    from game.core.asset_cache import build_asset_cache
+
+    build_asset_cache()
+
+
+def task_build_assets() -> dict:  # type: ignore[type-arg]
+    """Pre-decode the images of the assets into `game/assets/.cache`."""
+    assets = Path("game/assets")
+    return {
+        "actions": [_build_assets],
+        "file_dep": [
+            str(path)
+            for pattern in ("**/*.png", "maps/*.json")
+            for path in sorted(assets.glob(pattern))
+        ],
+        "targets": [str(assets / ".cache/index.json")],
+        "verbosity": 2,
+    }
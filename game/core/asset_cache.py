@@ -0,0 +1,291 @@
+"""Pre-decoded RGBA copies of the PNG assets.
+
+Decoding the large tilesets and the character sheets dominates a cold start. The
+`build_assets` task decodes them once into `.npy` arrays listed in an index, then the
+game memory-maps those arrays instead of decoding the PNG files. Tilesets only keep
+the tiles that the map references, and are cropped after the last one.
+
+"""
+
+import hashlib
+import io
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import arcade
+import arcade.resources
+import numpy as np
+from beartype import beartype
+from loguru import logger
+from PIL import Image
+
+from .constants import ASSET_CACHE_DIR, ASSETS_DIR, MAP
+from .save_worker import write_atomic
+from .tile_layers import GID_MASK, TileLayers, decode_layer, summarize_tilesets
+
+ASSET_CACHE_VERSION = 1
+"""Increment when the cached files change to invalidate existing caches."""
+
+PRELOAD_PATTERNS = (
+    "*.png",
+    "animation/**/*.png",
+    "maps/input_prompts_kenney.png",
+)
+"""Images of the GUI, the vehicles, and the sparkles, relative to the assets."""
+
+ASSET_PATTERNS = (*PRELOAD_PATTERNS, "characters/**/*.png")
+"""Images loaded whole by the sprites and the GUI, relative to the assets."""
+
+RegionT = tuple[int, int, int, int]
+"""`x`, `y`, `width`, and `height` of a tile in its image."""
+
+
+@beartype
+def get_asset_key(path: str | Path) -> str:
+    """Key an image by its path relative to the working directory."""
+    return os.path.normpath(os.path.relpath(path))
+
+
+@beartype
+def _get_stamp(path: Path) -> list[Any]:
+    stat = path.stat()
+    return [get_asset_key(path), stat.st_size, stat.st_mtime_ns]
+
+
+@beartype
+def get_used_regions(map_path: Path = MAP) -> dict[str, list[RegionT]]:
+    """Return the regions of each tileset image that the map references.
+
+    Tiles of the tile layers, the objects, and the frames of their animations count.
+
+    """
+    tile_map = json.loads(map_path.read_text())
+    tile_layers = TileLayers(
+        {},
+        (tile_map["tilewidth"], tile_map["tileheight"]),
+        "",
+        tilesets=summarize_tilesets(tile_map, map_path.parent),
+    )
+    gids: set[int] = set()
+    for layer in tile_map["layers"]:
+        if layer["type"] == "tilelayer":
+            gids.update(int(gid) for gid in np.unique(decode_layer(layer) & GID_MASK))
+        elif layer["type"] == "objectgroup":
+            gids.update(
+                obj["gid"] & GID_MASK for obj in layer["objects"] if "gid" in obj
+            )
+    gids.discard(0)
+    for gid in [*gids]:
+        gids.update(
+            frame & GID_MASK for frame, _duration in tile_layers.get_animation(gid)
+        )
+    regions: dict[str, list[RegionT]] = {}
+    for gid in sorted(gids):
+        file_name, *region = tile_layers.get_tile_image(gid)
+        regions.setdefault(get_asset_key(file_name), []).append(tuple(region))  # type: ignore[arg-type]
+    return regions
+
+
+@beartype
+def _build_image(
+    cache_dir: Path,
+    key: str,
+    stamps: list[list[Any]],
+    previous: dict[str, Any],
+    regions: list[RegionT] | None = None,
+) -> dict[str, Any]:
+    """Decode the image unless the cached copy was built from the same sources."""
+    if (
+        (entry := previous.get(key))
+        and entry["stamps"] == stamps
+        and (cache_dir / entry["file"]).is_file()
+    ):
+        return entry  # type: ignore[no-any-return]
+    pixels = np.asarray(Image.open(key).convert("RGBA"))
+    if regions:
+        stripped = np.zeros_like(pixels)
+        for x, y, width, height in regions:
+            stripped[y : y + height, x : x + width] = pixels[
+                y : y + height, x : x + width
+            ]
+        bottom = max(y + height for _x, y, _width, height in regions)
+        right = max(x + width for x, _y, width, _height in regions)
+        pixels = stripped[:bottom, :right]
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(pixels))
+    file_name = f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.npy"
+    write_atomic(cache_dir / file_name, buffer.getvalue())
+    return {
+        "file": file_name,
+        "size": [pixels.shape[1], pixels.shape[0]],
+        "stamps": stamps,
+    }
+
+
+@beartype
+def build_asset_cache(
+    map_path: Path = MAP,
+    assets_dir: Path = ASSETS_DIR,
+    cache_dir: Path = ASSET_CACHE_DIR,
+) -> dict[str, Any]:
+    """Decode the assets that changed since the last build, then write the index."""
+    index_path = cache_dir / "index.json"
+    previous = {}
+    if index_path.is_file():
+        index = json.loads(index_path.read_text())
+        if index.get("version") == ASSET_CACHE_VERSION:
+            previous = index["images"]
+
+    images = {}
+    map_stamp = _get_stamp(map_path)
+    for key, regions in get_used_regions(map_path).items():
+        stamps = [_get_stamp(Path(key)), map_stamp]
+        images[key] = _build_image(cache_dir, key, stamps, previous, regions)
+    for path in sorted(
+        {path for pattern in ASSET_PATTERNS for path in assets_dir.glob(pattern)}
+    ):
+        if (key := get_asset_key(path)) not in images:
+            images[key] = _build_image(cache_dir, key, [_get_stamp(path)], previous)
+
+    index = {"version": ASSET_CACHE_VERSION, "images": images}
+    write_atomic(index_path, json.dumps(index).encode())
+    used_files = {entry["file"] for entry in images.values()}
+    for path in cache_dir.glob("*.npy"):
+        if path.name not in used_files:
+            path.unlink()
+    logger.info(f"Cached {len(images)} images in {cache_dir}")
+    return index
+
+
+class AssetCache:
+    """Memory-mapped images of the asset cache, ignoring those that are out of date."""
+
+    @beartype
+    def __init__(self, cache_dir: Path, images: dict[str, Any]) -> None:
+        self.cache_dir = cache_dir
+        self.images = images
+
+    @beartype
+    def get_image(self, path: str | Path) -> Image.Image | None:
+        """Return the cached image without decoding the file, if still current."""
+        if not (entry := self.images.get(get_asset_key(path))):
+            return None
+        try:
+            if any(_get_stamp(Path(stamp[0])) != stamp for stamp in entry["stamps"]):
+                return None
+            pixels = np.load(self.cache_dir / entry["file"], mmap_mode="r")
+        except (OSError, ValueError):
+            logger.exception(f"Failed to load the cached image of {path}")
+            return None
+        return Image.frombuffer(
+            "RGBA", tuple(entry["size"]), pixels, "raw", "RGBA", 0, 1
+        )
+
+
+@beartype
+def load_asset_cache(cache_dir: Path = ASSET_CACHE_DIR) -> AssetCache | None:
+    """Read the index of the asset cache, if it was built for this version."""
+    index_path = cache_dir / "index.json"
+    if not index_path.is_file():
+        return None
+    index = json.loads(index_path.read_text())
+    if index.get("version") != ASSET_CACHE_VERSION:
+        logger.warning(f"Ignoring {cache_dir}. Run 'doit run build_assets' to update")
+        return None
+    return AssetCache(cache_dir, index["images"])
+
+
+@lru_cache(maxsize=None)
+def _get_default_cache() -> AssetCache | None:
+    return load_asset_cache()
+
+
+@beartype
+def add_resource_handles() -> None:
+    """Register the resource handles used to name the assets, like `:maps:`."""
+    arcade.resources.add_resource_handle("assets", "game/assets")
+    arcade.resources.add_resource_handle("characters", "game/assets/characters")
+    arcade.resources.add_resource_handle("maps", "game/assets/maps")
+    arcade.resources.add_resource_handle("sounds", "game/assets/sounds")
+    arcade.resources.add_resource_handle("animation", "game/assets/animation")
+
+
+@beartype
+def get_asset_keys(map_path: Path = MAP, assets_dir: Path = ASSETS_DIR) -> list[str]:
+    """Return the keys of the tileset images and of the images to preload.
+
+    The character sheets are picked by the task code when the sprites are created, so
+    only the few that are used are loaded then.
+
+    """
+    tile_map = json.loads(map_path.read_text())
+    keys = {
+        get_asset_key(tileset["image"])
+        for tileset in summarize_tilesets(tile_map, map_path.parent)
+    }
+    keys.update(
+        get_asset_key(path)
+        for pattern in PRELOAD_PATTERNS
+        for path in assets_dir.glob(pattern)
+    )
+    return sorted(keys)
+
+
+@beartype
+def open_image(path: str | Path) -> Image.Image:
+    """Return the image already in arcade's texture cache, from the asset cache, or
+    decoded from the file.
+
+    """
+    texture_cache = arcade.load_texture.texture_cache  # type: ignore[attr-defined]
+    if texture := texture_cache.get(get_asset_key(path)):
+        return texture.image
+    if (cache := _get_default_cache()) and (image := cache.get_image(path)):
+        return image
+    return Image.open(path).convert("RGBA")
+
+
+@beartype
+def get_texture_names(key: str) -> list[str]:
+    """Return the relative, absolute, and resource handle names of the image.
+
+    Arcade keeps the image of each file in its texture cache, keyed by the name that
+    was passed to it, so an image has to be added under each name it is loaded by.
+
+    """
+    absolute = Path(key).resolve()
+    names = {key, str(absolute)}
+    for handle, handle_path in arcade.resources.resource_handles.items():
+        if absolute.is_relative_to(handle_path):
+            names.add(f":{handle}:{absolute.relative_to(handle_path).as_posix()}")
+    return sorted(names)
+
+
+@beartype
+def add_texture(key: str, image: Image.Image, names: list[str] | None = None) -> None:
+    """Add the image to arcade's texture cache, keeping images already loaded."""
+    texture_cache = arcade.load_texture.texture_cache  # type: ignore[attr-defined]
+    texture = arcade.Texture(key, image, hit_box_algorithm="None")
+    for name in names or get_texture_names(key):
+        texture_cache.setdefault(name, texture)
+
+
+@beartype
+def install_texture_cache(asset_cache: AssetCache | None = None) -> int:
+    """Let `arcade.load_texture` crop the cached images instead of decoding files.
+
+    Returns the number of images that were added.
+
+    """
+    asset_cache = asset_cache or _get_default_cache()
+    if not asset_cache:
+        return 0
+    added = 0
+    for key in asset_cache.images:
+        if image := asset_cache.get_image(key):
+            add_texture(key, image)
+            added += 1
+    return added
@@ -0,0 +1,83 @@
+"""Decode the images and sounds of the game in a thread pool while it starts.
+
+PIL and the zlib decoder release the GIL, so the files are decoded in parallel while
+the window keeps drawing the loading view. Only the main thread, which owns the GL
+context, hands the finished images to arcade's texture cache.
+
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from beartype import beartype
+from loguru import logger
+from PIL import Image
+
+from .asset_cache import add_texture, get_asset_keys, get_texture_names, open_image
+from .constants import ASSETS_DIR
+from .views.sounds import load_sound
+
+
+@beartype
+def _decode_image(key: str) -> tuple[Image.Image, list[str]]:
+    # Copying reads the pages of memory-mapped images in the worker
+    return open_image(key).copy(), get_texture_names(key)
+
+
+@beartype
+def _decode_sound(key: str) -> None:
+    load_sound(key)
+
+
+class AssetPreloader:
+    """Decode the assets in the background and collect them on the main thread."""
+
+    @beartype
+    def __init__(
+        self,
+        images: list[str] | None = None,
+        sounds: list[str] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        if images is None:
+            images = get_asset_keys()
+        if sounds is None:
+            sounds = [str(path) for path in sorted(ASSETS_DIR.glob("sounds/*.wav"))]
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="preload")
+        self._pending: dict[Future, tuple[str, bool]] = {  # type: ignore[type-arg]
+            self._executor.submit(_decode_image, key): (key, True) for key in images
+        }
+        self._pending.update(
+            {self._executor.submit(_decode_sound, key): (key, False) for key in sounds}
+        )
+        self.total = len(self._pending)
+        self._executor.shutdown(wait=False)
+
+    @property
+    @beartype
+    def finished(self) -> bool:
+        return not self._pending
+
+    @beartype
+    def poll(self) -> float:
+        """Hand the decoded images to arcade and return the fraction that is done.
+
+        Assets that fail to decode are logged and left for the game to load.
+
+        """
+        for future in [future for future in self._pending if future.done()]:
+            key, is_image = self._pending.pop(future)
+            try:
+                result = future.result()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(f"Failed to preload {key}")
+                continue
+            if is_image:
+                add_texture(key, *result)
+        return 1 - len(self._pending) / self.total if self.total else 1.0
+
+    @beartype
+    def wait(self) -> None:
+        """Block until every asset was decoded and handed to arcade."""
+        for future in [*self._pending]:
+            future.exception()
+        self.poll()
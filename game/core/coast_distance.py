@@ -0,0 +1,174 @@
+"""Distance field from every cell of the map to the nearest land.
+
+Docking checks whether the raft is close to the shore and where to put the player.
+Both are answered by indexing arrays that are computed once per map and collision
+profile, instead of scanning every wall sprite.
+
+"""
+
+import hashlib
+import io
+import math
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from beartype import beartype
+from loguru import logger
+
+from .constants import MAP_CACHE_DIR, NumT
+from .save_worker import write_atomic
+from .tile_layers import prune_map_cache
+
+COAST_DISTANCE_VERSION = 1
+"""Increment when the cached arrays change to invalidate existing caches."""
+
+MaskT = npt.NDArray[np.bool_]
+
+
+@beartype
+def _transform_lines(
+    costs: npt.NDArray[np.float64],
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+    """Squared distance transform of each row, with the index of the nearest site.
+
+    Felzenszwalb and Huttenlocher's lower envelope of parabolas, computed for every
+    row at once. Sites are the finite costs. Rows without any site stay infinite,
+    with an index of `-1`.
+
+    """
+    lines, size = costs.shape
+    rows = np.arange(lines)
+    sites = np.zeros((lines, size), dtype=np.int64)
+    bounds = np.full((lines, size + 1), np.inf)
+    last = np.full(lines, -1)
+    for index in range(size):
+        active = np.isfinite(costs[:, index])
+        height = costs[:, index] + index**2
+        start = np.full(lines, -np.inf)
+        pending = active & (last >= 0)
+        while pending.any():
+            line = rows[pending]
+            site = sites[line, last[line]]
+            crossing = (height[line] - costs[line, site] - site**2) / (
+                2 * (index - site)
+            )
+            start[line] = crossing
+            hidden = crossing <= bounds[line, last[line]]
+            last[line[hidden]] -= 1
+            pending[line] = hidden & (last[line] >= 0)
+        start[active & (last < 0)] = -np.inf
+        line = rows[active]
+        last[line] += 1
+        sites[line, last[line]] = index
+        bounds[line, last[line]] = start[line]
+        bounds[line, last[line] + 1] = np.inf
+
+    distance = np.full((lines, size), np.inf)
+    nearest = np.full((lines, size), -1, dtype=np.int64)
+    line = rows[last >= 0]
+    current = np.zeros(len(line), dtype=np.int64)
+    for index in range(size):
+        while (advance := bounds[line, current + 1] < index).any():
+            current[advance] += 1
+        site = sites[line, current]
+        distance[line, index] = (index - site) ** 2 + costs[line, site]
+        nearest[line, index] = site
+    return distance, nearest
+
+
+@beartype
+def compute_nearest_land(
+    land: MaskT,
+) -> tuple[npt.NDArray[np.int16], npt.NDArray[np.float32]]:
+    """Return the nearest land cell and its distance in cells for every cell.
+
+    The exact Euclidean distance transform runs down the columns, then along the
+    rows, so the cost follows the size of the map and not the length of the coast.
+    Land cells are their own nearest land. Without any land, the distance is
+    infinite.
+
+    """
+    costs = np.where(land, 0.0, np.inf)
+    column_distance, column_nearest = _transform_lines(costs.T)
+    squared, nearest_column = _transform_lines(column_distance.T)
+    nearest_row = np.take_along_axis(
+        column_nearest.T, np.maximum(nearest_column, 0), axis=1
+    )
+    nearest = np.stack((nearest_row, nearest_column), axis=-1).astype(np.int16)
+    return nearest, np.sqrt(squared).astype(np.float32)
+
+
+class CoastDistanceField:
+    """Nearest land for each cell. Rows are counted from the bottom of the map."""
+
+    @beartype
+    def __init__(
+        self,
+        nearest: npt.NDArray[np.int16],
+        distance: npt.NDArray[np.float32],
+        tile_size: tuple[int, int],
+    ) -> None:
+        self.nearest = nearest
+        self.distance = distance
+        self.tile_width, self.tile_height = tile_size
+
+    @beartype
+    def nearest_land(
+        self, x: NumT, y: NumT
+    ) -> tuple[tuple[float, float], float] | None:
+        """Return the center of the closest land tile and its distance in pixels."""
+        row = math.floor(y / self.tile_height)
+        column = math.floor(x / self.tile_width)
+        rows, columns = self.distance.shape
+        if not (0 <= row < rows and 0 <= column < columns):
+            return None
+        if math.isinf(self.distance[row, column]):
+            return None
+        land_row, land_column = self.nearest[row, column]
+        center = (
+            (int(land_column) + 0.5) * self.tile_width,
+            (int(land_row) + 0.5) * self.tile_height,
+        )
+        return center, math.dist((x, y), center)
+
+    @beartype
+    def is_near_land(self, x: NumT, y: NumT, reach: NumT) -> bool:
+        """Check if a box of half-size `reach` centered on the point touches land."""
+        if not (match := self.nearest_land(x, y)):
+            return False
+        half_tile = max(self.tile_width, self.tile_height) / 2
+        return match[1] <= reach + half_tile
+
+
+@beartype
+def load_coast_distance(
+    land: MaskT,
+    tile_size: tuple[int, int],
+    map_hash: str,
+    cache_root: Path = MAP_CACHE_DIR,
+) -> CoastDistanceField:
+    """Return the distance field of the land mask, computing it on a cache miss."""
+    mask_key = hashlib.sha256(np.packbits(land).tobytes()).hexdigest()[:8]
+    cache_path = (
+        cache_root
+        / map_hash
+        / f"coast_distance-v{COAST_DISTANCE_VERSION}-{mask_key}.npz"
+    )
+    if cache_path.is_file():
+        try:
+            with np.load(cache_path) as cached:
+                return CoastDistanceField(
+                    cached["nearest"], cached["distance"], tile_size
+                )
+        except (OSError, ValueError, KeyError):
+            logger.exception(f"Failed to load {cache_path}. Recomputing")
+
+    nearest, distance = compute_nearest_land(land)
+    buffer = io.BytesIO()
+    np.savez(buffer, nearest=nearest, distance=distance)
+    write_atomic(cache_path, buffer.getvalue())
+    prune_map_cache(
+        cache_path, "coast_distance", f"coast_distance-v{COAST_DISTANCE_VERSION}-"
+    )
+    return CoastDistanceField(nearest, distance, tile_size)
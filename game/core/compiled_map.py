@@ -0,0 +1,294 @@
+"""Compiled map cache to skip parsing the Tiled map and tilesets on warm starts.
+
+The first load of each version of the map is done by arcade. The resulting sprites
+are then compiled to plain records (texture regions, positions, layer membership,
+properties, and spatial hash buckets) that are restored directly on later loads.
+
+"""
+
+import hashlib
+import pickle  # nosec B403
+from collections import OrderedDict
+from collections.abc import Callable, Collection
+from pathlib import Path
+from typing import Any
+
+import arcade
+from arcade.sprite_list.spatial_hash import _SpatialHash
+from arcade.tilemap import load_tilemap
+from beartype import beartype
+from loguru import logger
+from pytiled_parser.tiled_map import TiledMap
+
+from .constants import MAP_CACHE_DIR
+from .save_worker import write_atomic
+from .tile_layers import get_map_hash, prune_map_cache
+
+COMPILED_MAP_VERSION = 3
+"""Increment when the compiled format changes to invalidate existing caches."""
+
+LayerOptionsT = dict[str, dict[str, Any]]
+SpriteRecordT = dict[str, Any]
+
+
+class UnsupportedSpriteError(Exception):
+    """The sprite cannot be restored from a compiled record."""
+
+
+class CompiledTileMap:
+    """Subset of `arcade.TileMap` that is used by the game and restored from cache."""
+
+    @beartype
+    def __init__(
+        self,
+        sprite_lists: OrderedDict[str, arcade.SpriteList],
+        width: int,
+        height: int,
+        background_color: Any,
+        properties: Any,
+    ) -> None:
+        self.sprite_lists = sprite_lists
+        self.width = width
+        self.height = height
+        self.background_color = background_color
+        self.properties = properties
+
+
+@beartype
+def _parse_texture_key(texture: arcade.Texture) -> tuple[Any, ...]:
+    """Recover the `load_texture` arguments from arcade's texture cache name.
+
+    Format: `{file}-{x}-{y}-{width}-{height}-{flip_h}-{flip_v}-{flip_d}-{algorithm} `
+
+    """
+    parts = texture.name.rstrip(" ").rsplit("-", 8)
+    if len(parts) != 9:
+        raise UnsupportedSpriteError(f"Unknown texture: {texture.name}")
+    file_name, *region, flip_h, flip_v, flip_d, algorithm = parts
+    return (
+        file_name,
+        *(int(float(value)) for value in region),
+        flip_h == "True",
+        flip_v == "True",
+        flip_d == "True",
+        algorithm,
+    )
+
+
+@beartype
+def compile_tilemap(tile_map: arcade.TileMap) -> dict[str, Any]:
+    """Reduce the arcade sprites to plain records that can be pickled."""
+    textures: dict[str, int] = {}
+    texture_records: list[dict[str, Any]] = []
+    layers = []
+    for name, sprite_list in tile_map.sprite_lists.items():
+        sprites = []
+        for sprite in sprite_list:
+            if type(sprite) is not arcade.Sprite:  # pylint: disable=C0123
+                raise UnsupportedSpriteError(f"{type(sprite)} in layer '{name}'")
+            texture = sprite.texture
+            if texture.name not in textures:
+                textures[texture.name] = len(texture_records)
+                texture_records.append(
+                    {
+                        "key": _parse_texture_key(texture),
+                        "hit_box": texture.hit_box_points,
+                    }
+                )
+            hit_box = sprite.get_hit_box()
+            sprites.append(
+                {
+                    "texture": textures[texture.name],
+                    "position": sprite.position,
+                    "size": (sprite.width, sprite.height),
+                    "angle": sprite.angle,
+                    "color": sprite.color,
+                    "alpha": sprite.alpha,
+                    "properties": sprite.properties,
+                    "hit_box": None if hit_box == texture.hit_box_points else hit_box,
+                }
+            )
+        spatial_hash = sprite_list.spatial_hash
+        layers.append(
+            {
+                "name": name,
+                "sprites": sprites,
+                "cell_size": spatial_hash.cell_size if spatial_hash else None,
+                "buckets": (
+                    _get_bucket_keys(spatial_hash, sprite_list)
+                    if spatial_hash
+                    else None
+                ),
+            }
+        )
+    return {
+        "textures": texture_records,
+        "layers": layers,
+        "width": tile_map.width,
+        "height": tile_map.height,
+        "background_color": tile_map.background_color,
+        "properties": tile_map.properties,
+    }
+
+
+@beartype
+def _get_bucket_keys(
+    spatial_hash: _SpatialHash, sprite_list: arcade.SpriteList
+) -> list[list[tuple[int, int]]]:
+    """Return the spatial hash cells of each sprite in list order."""
+    cells_for_bucket = {
+        id(bucket): key for key, bucket in spatial_hash.contents.items()
+    }
+    return [
+        [
+            cells_for_bucket[id(bucket)]
+            for bucket in spatial_hash.buckets_for_sprite[sprite]
+        ]
+        for sprite in sprite_list
+    ]
+
+
+@beartype
+def restore_sprite(
+    record: SpriteRecordT, textures: list[arcade.Texture]
+) -> arcade.Sprite:
+    sprite = arcade.Sprite(texture=textures[record["texture"]])
+    sprite.position = record["position"]
+    sprite.width, sprite.height = record["size"]
+    sprite.angle = record["angle"]
+    sprite.color = record["color"]
+    sprite.alpha = record["alpha"]
+    sprite.properties = record["properties"]
+    if record["hit_box"] is not None:
+        sprite.set_hit_box(record["hit_box"])
+    return sprite
+
+
+@beartype
+def restore_tilemap(compiled: dict[str, Any]) -> CompiledTileMap:
+    """Recreate the sprite lists without parsing the Tiled map or tilesets."""
+    textures = []
+    for record in compiled["textures"]:
+        file_name, x, y, width, height, flip_h, flip_v, flip_d, algorithm = record[
+            "key"
+        ]
+        texture = arcade.load_texture(
+            file_name,
+            x,
+            y,
+            width,
+            height,
+            flipped_horizontally=flip_h,
+            flipped_vertically=flip_v,
+            flipped_diagonally=flip_d,
+            hit_box_algorithm=algorithm,
+        )
+        if texture._hit_box_points is None:  # pylint: disable=W0212
+            texture._hit_box_points = record["hit_box"]  # pylint: disable=W0212
+        textures.append(texture)
+
+    sprite_lists: OrderedDict[str, arcade.SpriteList] = OrderedDict()
+    for layer in compiled["layers"]:
+        sprite_list = arcade.SpriteList()
+        sprites = [restore_sprite(record, textures) for record in layer["sprites"]]
+        sprite_list.extend(sprites)
+        if layer["cell_size"]:
+            sprite_list.spatial_hash = _restore_spatial_hash(
+                layer["cell_size"], sprites, layer["buckets"]
+            )
+            sprite_list._use_spatial_hash = True  # pylint: disable=W0212
+        sprite_lists[layer["name"]] = sprite_list
+
+    return CompiledTileMap(
+        sprite_lists=sprite_lists,
+        width=compiled["width"],
+        height=compiled["height"],
+        background_color=compiled["background_color"],
+        properties=compiled["properties"],
+    )
+
+
+@beartype
+def _restore_spatial_hash(
+    cell_size: int,
+    sprites: list[arcade.Sprite],
+    buckets: list[list[tuple[int, int]]],
+) -> _SpatialHash:
+    """Fill the spatial hash from the saved cells instead of each sprite's bounds."""
+    spatial_hash = _SpatialHash(cell_size=cell_size)  # type: ignore[no-untyped-call]
+    for sprite, keys in zip(sprites, buckets):
+        sprite_buckets = []
+        for key in keys:
+            bucket = spatial_hash.contents.setdefault(key, [])
+            bucket.append(sprite)
+            sprite_buckets.append(bucket)
+        spatial_hash.buckets_for_sprite[sprite] = sprite_buckets
+    return spatial_hash
+
+
+@beartype
+def _get_scene_prefix() -> str:
+    return f"scene-v{COMPILED_MAP_VERSION}-{arcade.__version__}-"
+
+
+@beartype
+def get_compiled_map_path(
+    map_path: Path,
+    layer_options: LayerOptionsT,
+    cache_root: Path = MAP_CACHE_DIR,
+    map_hash: str | None = None,
+    streamed_layers: Collection[str] = (),
+) -> Path:
+    """Key the compiled scene by the map, the layer options, and the arcade version.
+
+    The map hash covers the tilesets, so editing one compiles the scene again.
+
+    """
+    options = repr((sorted(layer_options.items()), sorted(streamed_layers))).encode()
+    options_key = hashlib.sha256(options).hexdigest()[:8]
+    name = f"{_get_scene_prefix()}{options_key}.pickle"
+    return cache_root / (map_hash or get_map_hash(map_path)) / name
+
+
+@beartype
+def load_compiled_tilemap(
+    map_path: Path,
+    layer_options: LayerOptionsT,
+    cache_root: Path = MAP_CACHE_DIR,
+    map_hash: str | None = None,
+    parse_map: Callable[[], TiledMap] | None = None,
+    streamed_layers: Collection[str] = (),
+) -> arcade.TileMap | CompiledTileMap:
+    """Restore the map from the compiled cache, compiling it on a cache miss.
+
+    `parse_map` can provide the map from an existing parse instead of the file.
+    The `streamed_layers` are drawn from the gid arrays, so they have no sprite list.
+
+    """
+    compiled_path = get_compiled_map_path(
+        map_path, layer_options, cache_root, map_hash, streamed_layers
+    )
+    if compiled_path.is_file():
+        try:
+            compiled = pickle.loads(compiled_path.read_bytes())  # nosec B301
+            return restore_tilemap(compiled)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f"Failed to restore {compiled_path}. Recompiling")
+
+    if parse_map:
+        tile_map = arcade.TileMap(
+            tiled_map=parse_map(), scaling=1, layer_options=layer_options
+        )
+    else:
+        tile_map = load_tilemap(map_path, scaling=1, layer_options=layer_options)
+    # Release the sprites that arcade created for the streamed layers
+    for name in streamed_layers:
+        tile_map.sprite_lists.pop(name, None)
+    try:
+        compiled = compile_tilemap(tile_map)
+    except UnsupportedSpriteError as exc:
+        logger.warning(f"Map will not be compiled: {exc}")
+        return tile_map
+    write_atomic(compiled_path, pickle.dumps(compiled, pickle.HIGHEST_PROTOCOL))
+    prune_map_cache(compiled_path, "scene", _get_scene_prefix())
+    return tile_map
@@ -22,9 +22,19 @@ MOVEMENT_SPEED = 3
 HORIZONTAL_MARGIN = 650
 VERTICAL_MARGIN = 300
 
+ASSETS_DIR = Path("game/assets")
+ASSET_CACHE_DIR = ASSETS_DIR / ".cache"
+"""Pre-decoded images of the assets, built by the `build_assets` task."""
+
 # What map, and what position we start at
 MAP = Path("game/assets/maps/map.json")
 MAP_SIZE = 4000
+MAP_CACHE_DIR = MAP.parent / ".cache"
+"""Data derived from the map, keyed by the hash of the map file."""
+MAP_CHUNK_SIZE = 16
+"""Tiles per side of the chunks of the map that are streamed around the camera."""
+MAP_CHUNK_BUDGET = 24
+"""Number of chunks whose sprites are kept in memory, unless more are visible."""
 STARTING_X = 3600
 STARTING_Y = 600
 
@@ -61,8 +71,14 @@ SEARCH = [arcade.key.E]
 CAMERA_SPEED = 0.1
 
 SAVE_FILE_DIR = MAP.parent
+STATE_DB_FILE = SAVE_FILE_DIR / "save.sqlite3"
+"""SQLite store of the player, map mutations, sprite states, and item textures."""
 PLAYER_SAVE_FILE = SAVE_FILE_DIR / "player_save_file"
+"""Legacy player save. Migrated to the `STATE_DB_FILE` when found."""
 MAP_SAVE_FILE = SAVE_FILE_DIR / "map_save_file.json"
+"""Legacy full copy of the map. Migrated to the `STATE_DB_FILE` when found."""
+SPRITE_STATE_FLUSH_INTERVAL = 5.0
+"""Seconds between writes of the sprite states that changed."""
 
 ITEM_CONFIG = {
     "Pickaxe": {
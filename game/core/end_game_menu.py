@@ -46,7 +46,7 @@ class EndGameMenu(arcade.View):
         self.window.show_view(self.game_view)  # type: ignore[has-type]
 
     def on_click_quit(self, event):  # type: ignore[no-untyped-def]
-        arcade.exit()  # type: ignore[no-untyped-call]
+        self.game_view.quit_game()
 
     @beartype
     def on_key_press(self, key: int, modifiers: int) -> None:
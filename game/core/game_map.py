@@ -1,16 +1,36 @@
 """Game Map."""
 
 from collections import OrderedDict
+from collections.abc import Callable
 
 import arcade
 from arcade.sprite import Sprite
-from arcade.tilemap import load_tilemap
 from beartype import beartype
-from loguru import logger
 
+from .coast_distance import load_coast_distance
+from .compiled_map import load_compiled_tilemap
+from .constants import NumT
 from .game_clock import GameClock
 from .game_state import GameState
-from .views.animated_sprite import AnimatedSprite
+from .map_chunks import MapChunks
+from .map_loader import MAP_LAYER_OPTIONS, MAP_STATIC_LAYERS
+from .occupancy_grid import OccupancyGrid
+from .spatial_index import SpatialIndex
+from .view_culling import ViewCuller
+from .views.particles import ParticleEmitters
+
+COLLISION_PROFILES: dict[str, Callable[[str], bool]] = {
+    # Any layer with '_blocking' or 'coast' will be a wall
+    "land": lambda layer: "_blocking" in layer or "coast" in layer,
+    # Any layer not with 'water' or 'coast' will be a wall
+    "water": lambda layer: "water" not in layer and "coast" not in layer,
+    # PLANNED: the carriage is blocked like the player until there are roads
+    "carriage": lambda layer: "_blocking" in layer or "coast" in layer,
+}
+"""Layers that block movement for each way of getting around the map."""
+
+EFFECT_LAYERS = ["dropped_items"]
+"""Sprites drawn over the map layers, which are also culled to the view."""
 
 
 class GameMap:
@@ -20,42 +40,59 @@ class GameMap:
     def __init__(self, state: GameState, game_clock: GameClock) -> None:
         self.state = state
         self.game_clock = game_clock
+        self.animation_start = game_clock.current_time
+        self.tile_layers = state.tile_layers
         self.load()
 
         self.dropped_items = arcade.SpriteList()
+        self.sparkles = ParticleEmitters(self.game_clock, "sparkle", scale=0.8)
         self.generate_sparkles()
 
     @beartype
     def generate_sparkles(self) -> None:
-        self.sparkles = arcade.SpriteList()
+        self.sparkles.clear()
         for item in self.map_layers.get("searchable", []):
-            self.sparkles.append(
-                AnimatedSprite(
-                    self.game_clock,
-                    "sparkle",
-                    item.center_x,
-                    item.center_y,
-                    item,
-                    scale=0.8,
-                )
-            )
+            self.sparkles.add(item)
 
     @beartype
     def remove_sprite(self, removed_sprite: Sprite, searchable: bool) -> None:
         removed_sprite.properties["removed"] = True
         removed_sprite.remove_from_sprite_lists()
+        layer = "searchable" if searchable else "interactables_blocking"
+        self.update_occupancy(layer, removed_sprite, removed=True)
+        self.spatial_index.remove(layer, removed_sprite)
+        self.spatial_index.remove("dropped_items", removed_sprite)
+        self.sparkles.remove(removed_sprite)
         # If item has a drop, add to dropped items so it can be drawn
         if dropped_item := self.state.sync_removed_sprite(removed_sprite, searchable):
             self.dropped_items.append(dropped_item)
             self.map_layers["searchable"].append(dropped_item)
-            self.generate_sparkles()
+            self.update_occupancy("searchable", dropped_item)
+            self.spatial_index.insert("searchable", dropped_item)
+            self.spatial_index.insert("dropped_items", dropped_item)
+            self.sparkles.add(dropped_item)
+
+    @beartype
+    def update_view(self, left: NumT, bottom: NumT, width: NumT, height: NumT) -> None:
+        """Load the chunks around the camera and select the sprites in view."""
+        if self.chunks:
+            self.chunks.update(left, bottom, width, height)
+        self.culler.update(left, bottom, width, height)
+
+    @property
+    @beartype
+    def draw_counts(self) -> dict[str, tuple[int, int]]:
+        """Submitted and culled chunks or sprites for each layer in the last view."""
+        counts = dict(self.chunks.counts) if self.chunks else {}
+        return counts | self.culler.counts
 
     @beartype
     def draw(self) -> None:
-        self.scene.draw()
-        if len(self.dropped_items):
-            self.dropped_items.draw()  # type: ignore[no-untyped-call]
-        self.sparkles.draw()  # type: ignore[no-untyped-call]
+        if self.chunks:
+            elapsed = self.game_clock.current_time - self.animation_start
+            self.chunks.draw(elapsed.total_seconds() * 1000)
+        self.culler.draw()
+        self.sparkles.draw()
 
     @beartype
     def on_update(self) -> None:
@@ -65,28 +102,26 @@ class GameMap:
     def load(self) -> None:
         self.map_layers = OrderedDict()  # type: ignore[var-annotated]
 
-        # List of blocking sprites
-        layer_options = {
-            "trees_blocking": {
-                "use_spatial_hash": True,
-            },
-            "misc_blocking": {
-                "use_spatial_hash": True,
-            },
-            "bridges": {
-                "use_spatial_hash": True,
-            },
-            "water_blocking": {
-                "use_spatial_hash": True,
-            },
-        }
-
-        # Read in the tiled tile_path
-        tile_path = self.state.map_path
-        logger.debug(f"Loading tile_path: {tile_path}")
-        tile_map = load_tilemap(tile_path, scaling=1, layer_options=layer_options)
-
-        self.scene = arcade.Scene.from_tilemap(tile_map)
+        # Reuse the map loaded with the game state, then keep only the sprite lists
+        tile_map = self.state.scene_map or load_compiled_tilemap(
+            self.state.map_path,
+            MAP_LAYER_OPTIONS,
+            streamed_layers=[*self.tile_layers.layers],
+        )
+        self.state.scene_map = None
+
+        # Tile layers without sprites are drawn from their gids near the camera
+        self.chunks = None
+        if streamed := [
+            name
+            for name in self.tile_layers.layers
+            if name not in tile_map.sprite_lists
+        ]:
+            self.chunks = MapChunks(
+                self.tile_layers, streamed, static_layers=MAP_STATIC_LAYERS
+            )
+
+        self.scene = arcade.Scene.from_tilemap(tile_map)  # type: ignore[arg-type]
 
         # Get all the tiled sprite lists
         self.map_layers = tile_map.sprite_lists  # type: ignore[assignment]
@@ -99,28 +134,104 @@ class GameMap:
 
         self.properties = tile_map.properties
 
-        self.scene.add_sprite_list("wall_list", use_spatial_hash=True)
+        self.apply_map_delta()
 
+        self.build_spatial_index()
+        self.build_collision_profiles()
         if self.state.inverse_movement:
             self.move_on_water()
         else:
             self.move_on_land()
 
-    def move_on_land(self) -> None:
-        """Any layer with '_blocking' will be a wall."""
-        self.scene["wall_list"].clear()
+    @beartype
+    def apply_map_delta(self) -> None:
+        """Replay the saved mutations over the sprites of the pristine map."""
+        removed_ids = self.state.map_delta.removed_ids
+        for layer in ("searchable", "interactables_blocking"):
+            for sprite in [*self.map_layers.get(layer, [])]:
+                if sprite.properties.get("id") in removed_ids:
+                    sprite.remove_from_sprite_lists()
+        if dropped_sprites := self.state.load_dropped_sprites():
+            if "searchable" not in self.map_layers:
+                self.map_layers["searchable"] = arcade.SpriteList(use_spatial_hash=True)
+                self.scene.add_sprite_list(
+                    "searchable", sprite_list=self.map_layers["searchable"]
+                )
+            self.map_layers["searchable"].extend(dropped_sprites)
+
+    @beartype
+    def build_spatial_index(self) -> None:
+        """Index the sprites of every layer that is not streamed to draw and query."""
+        tile_width, tile_height = self.tile_layers.tile_size
+        columns, rows = self.map_size
+        self.spatial_index = SpatialIndex(columns * tile_width, rows * tile_height)
+        self.culler = ViewCuller(self.spatial_index, [*self.map_layers, *EFFECT_LAYERS])
         for layer, sprite_list in self.map_layers.items():
-            if "_blocking" in layer or "coast" in layer:
-                self.scene["wall_list"].extend(sprite_list)
+            self.culler.set_order(sprite_list)
+            for sprite in sprite_list:
+                self.spatial_index.insert(layer, sprite)
+
+    @beartype
+    def build_collision_profiles(self) -> None:
+        """Build the occupancy grid of each profile once.
+
+        The grids count the tiles of the wall layers and the sprites of the wall object
+        layers, so switching profiles only swaps the grid. The distance to the nearest
+        cell that blocks the raft but not the player is precomputed from the grids for
+        docking.
+
+        """
+        self.occupancy_grids = {}
+        for name, is_wall in COLLISION_PROFILES.items():
+            tile_walls = [layer for layer in self.tile_layers.layers if is_wall(layer)]
+            grid = OccupancyGrid.from_tile_layers(self.tile_layers, tile_walls)
+            for layer, sprite_list in self.map_layers.items():
+                if is_wall(layer) and layer not in self.tile_layers:
+                    for sprite in sprite_list:
+                        grid.add_sprite(sprite)
+            self.occupancy_grids[name] = grid
+        dockable = (self.occupancy_grids["water"].counts > 0) & (
+            self.occupancy_grids["land"].counts == 0
+        )
+        self.coast_distance = load_coast_distance(
+            dockable, self.tile_layers.tile_size, self.tile_layers.map_hash
+        )
+
+    @beartype
+    def update_occupancy(
+        self, layer: str, sprite: Sprite, removed: bool = False
+    ) -> None:
+        """Sync the occupancy grids after a sprite is added to or removed from a layer."""
+        for name, is_wall in COLLISION_PROFILES.items():
+            if is_wall(layer):
+                grid = self.occupancy_grids[name]
+                if removed:
+                    grid.remove_sprite(sprite)
+                else:
+                    grid.add_sprite(sprite)
+
+    @beartype
+    def use_collision_profile(self, name: str) -> None:
+        self.collision_profile = name
+        self.grid = self.occupancy_grids[name]
+
+    @beartype
+    def move_on_land(self) -> None:
+        self.use_collision_profile("land")
 
     @beartype
     def move_on_water(self) -> None:
-        """Any layer not with 'water' or 'coast' will be a wall."""
-        self.scene["wall_list"].clear()
-        for layer, sprite_list in self.map_layers.items():
-            if "water" not in layer and "coast" not in layer:
-                self.scene["wall_list"].extend(sprite_list)
+        self.use_collision_profile("water")
 
-    def closest_land_coordinates(self, sprite: Sprite) -> Sprite:
+    @beartype
+    def closest_land_coordinates(
+        self, sprite: Sprite
+    ) -> tuple[tuple[float, float], float] | None:
         """Get closest land coordinates when on water and trying to dock."""
-        return arcade.get_closest_sprite(sprite, self.scene["wall_list"])
+        return self.coast_distance.nearest_land(sprite.center_x, sprite.center_y)
+
+    @beartype
+    def can_dock(self, sprite: Sprite) -> bool:
+        """Check if the vehicle is touching the shore."""
+        reach = max(sprite.width, sprite.height) / 2
+        return self.coast_distance.is_near_land(sprite.center_x, sprite.center_y, reach)
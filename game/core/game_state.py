@@ -2,7 +2,7 @@
 
 import json
 import pickle
-from pathlib import Path
+from contextlib import suppress
 from uuid import uuid4
 
 import arcade
@@ -10,7 +10,25 @@ from arcade.sprite import Sprite
 from beartype import beartype
 from loguru import logger
 
-from .constants import DEFAULT_PLAYER_DATA, MAP, MAP_SAVE_FILE, PLAYER_SAVE_FILE
+from .compiled_map import CompiledTileMap
+from .constants import (
+    DEFAULT_PLAYER_DATA,
+    MAP,
+    MAP_SAVE_FILE,
+    PLAYER_SAVE_FILE,
+    NumT,
+)
+from .map_loader import load_map
+from .models.map_delta import MapDelta
+from .models.sprite_state import SPRITE_STATES
+from .player_save import (
+    TEXTURE_STORE,
+    decode_player_data,
+    encode_player_data,
+    is_binary_save,
+)
+from .save_worker import SAVE_WORKER
+from .state_store import STATE_STORE, StateStore
 from .views.vehicle_sprite import VehicleSprite, VehicleType
 
 
@@ -19,10 +37,14 @@ class GameState:
 
     def __init__(self):  # type: ignore[no-untyped-def]
         # Game state
-        self.map_path = self.get_map_path()
-        self._tile_map = self.get_map_data()
-        self._searchable_index = self.get_layer_index("searchable")
-        self._tree_index = self.get_layer_index("interactables_blocking")
+        self.store = STATE_STORE
+        migrate_saved_files(self.store)
+        self.map_path = MAP
+        self.map_delta = MapDelta.load(self.store)
+        loaded_map = load_map(self.map_delta, self.map_path)
+        self.scene_map: arcade.TileMap | CompiledTileMap | None = loaded_map.scene_map
+        self.map_objects = loaded_map.map_objects
+        self.tile_layers = loaded_map.tile_layers
 
         # Player state
         try:
@@ -33,27 +55,6 @@ class GameState:
             self.player_data = DEFAULT_PLAYER_DATA
             self.set_player_data()
 
-    @beartype
-    def get_map_path(self) -> Path:
-        if MAP_SAVE_FILE.is_file():
-            return MAP_SAVE_FILE
-        return MAP
-
-    @beartype
-    def get_map_data(self) -> dict:  # type: ignore[type-arg]
-        if MAP_SAVE_FILE.is_file():
-            with open(MAP_SAVE_FILE) as _f:
-                return json.load(_f)  # type: ignore[no-any-return]
-        with open(MAP) as _f:
-            return json.load(_f)  # type: ignore[no-any-return]
-
-    @beartype
-    def get_layer_index(self, name) -> int | None:  # type: ignore[no-untyped-def]
-        for idx, layer in enumerate(self._tile_map["layers"]):
-            if layer["name"] == name:
-                return idx
-        return None
-
     @beartype
     def set_player_data(self) -> None:
         self.center_x = self.player_data["x"]
@@ -71,17 +72,14 @@ class GameState:
 
     @beartype
     def get_player_data(self) -> dict:  # type: ignore[type-arg]
-        if PLAYER_SAVE_FILE.is_file():
-            with open(PLAYER_SAVE_FILE, "rb") as _f:
-                return pickle.load(_f)  # type: ignore[no-any-return]
+        if raw := self.store.get_player():
+            if is_binary_save(raw):
+                return decode_player_data(raw)
+            # Legacy pickled save, which is replaced on the next save
+            return pickle.loads(raw)  # type: ignore[no-any-return]  # nosec B301
         else:
             return DEFAULT_PLAYER_DATA
 
-    @beartype
-    def save_map_data(self) -> None:
-        with open(MAP_SAVE_FILE, "w") as _f:
-            json.dump(self._tile_map, _f)
-
     @beartype
     def save_player_data(self, player, vehicle) -> None:  # type: ignore[no-untyped-def]
         self.center_x = player.center_x
@@ -94,46 +92,37 @@ class GameState:
         data = {
             "x": self.center_x,
             "y": self.center_y,
-            "inventory": self.compress_inventory(self.inventory),  # type: ignore[arg-type]
-            "item": self.compress_item(self.item),
+            "item": self.item,
             "vehicle_type": self.vehicle.type if self.vehicle else None,
             "vehicle_x": self.vehicle_x,
             "vehicle_y": self.vehicle_y,
             "vehicle_docked": self.vehicle_docked,
         }
-        with open(PLAYER_SAVE_FILE, "wb") as _f:
-            pickle.dump(data, _f)
+        raw = encode_player_data(data, [item for item in self.inventory if item])
+        self.store.set_player(raw)
 
     @beartype
     def sync_removed_sprite(
         self, removed_sprite: Sprite, searchable: bool
     ) -> Sprite | None:
         sprite_id = removed_sprite.properties["id"]
-        index = self._searchable_index if searchable else self._tree_index
-        layer = self._tile_map["layers"][index]
+        layer_name = "searchable" if searchable else "interactables_blocking"
 
         dropped_sprite = None
 
-        if obj_to_remove := next(
-            (
-                obj
-                for obj in layer["objects"]
-                for prop in obj["properties"]
-                if prop["name"] == "id" and prop["value"] == sprite_id
-            ),
-            None,
-        ):
-            self._tile_map["layers"][index]["objects"].remove(obj_to_remove)
+        if obj_to_remove := self.map_objects[layer_name].pop(sprite_id):
+            self.map_delta.record_removal(layer_name, sprite_id)
             if item_drop := removed_sprite.properties.get("drop"):
-                dropped_sprite = arcade.Sprite(f":assets:{item_drop}.png")
-                dropped_sprite.properties = {"name": item_drop, "id": str(uuid4())}
-                dropped_sprite.center_x = removed_sprite.center_x
-                dropped_sprite.center_y = removed_sprite.center_y
-                # Best guess at unique IDs
-                new_gid = obj_to_remove["gid"] + 10_000
+                center = (removed_sprite.center_x, removed_sprite.center_y)
+                dropped_sprite = self.create_drop_sprite(
+                    item_drop, str(uuid4()), center
+                )
+                source = f"{item_drop}.json"
+                if new_tileset := self.map_objects.add_tileset(source):
+                    self.map_delta.record_tileset(new_tileset)
                 new_obj = {
-                    "id": obj_to_remove["id"] + 1_000,
-                    "gid": new_gid,
+                    "id": self.map_objects.allocate_object_id(),
+                    "gid": self.map_objects.first_gids[source],
                     "height": dropped_sprite.height,
                     "name": "",
                     "properties": [
@@ -146,44 +135,44 @@ class GameState:
                     "x": obj_to_remove["x"],
                     "y": obj_to_remove["y"],
                 }
-                new_index = self._searchable_index
-                self._tile_map["layers"][new_index]["objects"].append(new_obj)
-                self._tile_map["tilesets"].append(
-                    {"firstgid": new_gid, "source": f"{item_drop}.json"}
-                )
+                self.map_objects["searchable"].add(new_obj)
+                self.map_delta.record_drop("searchable", new_obj, center)
 
-            self.save_map_data()
         return dropped_sprite
 
     @beartype
-    def compress_item(self, item: Sprite | None) -> dict | None:  # type: ignore[type-arg]
-        if not item:
-            return None
-        compressed_item = {
-            "name": item.properties["name"],
-            "count": item.properties["count"],
-        }
-        try:
-            compressed_item["filename"] = item.filename
-        except Exception:  # pylint: disable=broad-except
-            compressed_item |= {
-                "texture": item.texture.name,
-                "image": item.texture.image,
-            }
-        if "equippable" in item.properties:
-            compressed_item["equippable"] = True
-        return compressed_item
+    def create_drop_sprite(
+        self, name: str, sprite_id: str, center: tuple[NumT, NumT] | list[NumT]
+    ) -> Sprite:
+        dropped_sprite = arcade.Sprite(f":assets:{name}.png")
+        dropped_sprite.properties = {"name": name, "id": sprite_id}
+        dropped_sprite.center_x, dropped_sprite.center_y = center
+        return dropped_sprite
 
     @beartype
-    def compress_inventory(self, inventory: list[Sprite | None]) -> list[dict]:  # type: ignore[type-arg]
-        return [self.compress_item(item) for item in inventory if item]  # type: ignore[misc]
+    def load_dropped_sprites(self) -> list[Sprite]:
+        """Recreate the sprites for drops recorded in the `map_delta`."""
+        sprites = []
+        for drop in self.map_delta.live_drops:
+            obj = drop["object"]
+            properties = {
+                prop["name"]: prop["value"] for prop in obj.get("properties", [])
+            }
+            sprites.append(
+                self.create_drop_sprite(
+                    properties["name"], properties["id"], drop["center"]
+                )
+            )
+        return sprites
 
     @beartype
     def load_item(self, item: dict | None) -> Sprite | None:  # type: ignore[type-arg]
         if not item:
             return None
 
-        if "filename" in item:
+        if "digest" in item:
+            sprite = arcade.Sprite(texture=TEXTURE_STORE.get(item["digest"]))
+        elif "filename" in item:
             sprite = arcade.Sprite(filename=item["filename"])
         else:
             texture = arcade.Texture(name=item["texture"], image=item["image"])
@@ -206,11 +195,46 @@ class GameState:
         # PLANNED: potentially add other vehicles in the future
 
 
+@beartype
+def migrate_saved_files(store: StateStore = STATE_STORE) -> None:
+    """Move the legacy save files into the store, then remove them."""
+    sprite_state_files = sorted(PLAYER_SAVE_FILE.parent.glob(".save-*.json"))
+    legacy_files = [
+        path for path in (MAP_SAVE_FILE, PLAYER_SAVE_FILE) if path.is_file()
+    ] + sprite_state_files
+    if not legacy_files:
+        return
+    SAVE_WORKER.flush()
+    logger.info(f"Migrating {len(legacy_files)} save files to {store.path}")
+    # Saved state that is already in the store takes precedence over stale files
+    if MAP_SAVE_FILE.is_file() and not store.map_records:
+        with open(MAP) as _f:
+            pristine = json.load(_f)
+        with open(MAP_SAVE_FILE) as _f:
+            saved = json.load(_f)
+        MapDelta.from_legacy_save(pristine, saved, store=store)
+    if PLAYER_SAVE_FILE.is_file() and store.get_player() is None:
+        store.set_player(PLAYER_SAVE_FILE.read_bytes())
+    for path in sprite_state_files:
+        with suppress(Exception):
+            data = path.read_text()
+            name = json.loads(data)["state_name"]
+            if store.get_sprite_state(name) is None:
+                store.set_sprite_state(name, data)
+    store.commit()
+    for path in legacy_files:
+        path.unlink()
+
+
 @beartype
 def remove_saved_data() -> None:
     """Reset the map state, which is also used in `doit reset_map`."""
+    SPRITE_STATES.clear()
+    STATE_STORE.clear()
+    TEXTURE_STORE.clear()
+    SAVE_WORKER.flush()
+    # Remove any legacy save files that were not yet migrated
     MAP_SAVE_FILE.unlink(missing_ok=True)
     PLAYER_SAVE_FILE.unlink(missing_ok=True)
-    # Remove additional files saved by the 'SpriteState.path_state'
     for pth in PLAYER_SAVE_FILE.parent.glob(".save-*"):
         pth.unlink()
@@ -6,20 +6,24 @@ from types import ModuleType
 
 import arcade
 import arcade.key
-import arcade.resources
 from beartype import beartype
 from loguru import logger
 from pyglet.math import Vec2
 
+from .asset_cache import add_resource_handles, install_texture_cache
 from .constants import CAMERA_SPEED, HORIZONTAL_MARGIN, MAP_SIZE, VERTICAL_MARGIN
 from .game_clock import GameClock
 from .game_map import GameMap
 from .game_state import GameState
 from .gui import GameGUI
 from .gui.rpg_movement import RPGMovement
+from .models.sprite_state import SPRITE_STATES
 from .pause_menu import PauseMenu
 from .pressed_keys import PressedKeys
 from .registration import Register, SpriteRegister
+from .save_worker import SAVE_WORKER
+from .state_store import STATE_STORE
+from .views.sprite_batch import SpriteBatch, pack_textures
 
 
 class GameView(arcade.View):  # pylint: disable=R0902
@@ -43,11 +47,8 @@ class GameView(arcade.View):  # pylint: disable=R0902
 
         """
         super().__init__(**kwargs)
-        arcade.resources.add_resource_handle("assets", "game/assets")
-        arcade.resources.add_resource_handle("characters", "game/assets/characters")
-        arcade.resources.add_resource_handle("maps", "game/assets/maps")
-        arcade.resources.add_resource_handle("sounds", "game/assets/sounds")
-        arcade.resources.add_resource_handle("animation", "game/assets/animation")
+        add_resource_handles()
+        install_texture_cache()
 
         self.state = GameState()  # type: ignore[no-untyped-call]
         self.game_clock = GameClock()
@@ -69,6 +70,7 @@ class GameView(arcade.View):  # pylint: disable=R0902
 
         self.registered_items: dict[str, Register] = {}
         self.registered_sprites = arcade.SpriteList()
+        self.dynamic_sprites = SpriteBatch()
         self.sprite_register = SpriteRegister()
         self.sprite_register.set_listener(self.on_register)
 
@@ -94,6 +96,8 @@ class GameView(arcade.View):  # pylint: disable=R0902
 
     @beartype
     def change_view_cb(self, new_view: Callable) -> None:
+        SPRITE_STATES.flush()
+        STATE_STORE.commit()
         self.window.show_view(new_view(self))
 
     @beartype
@@ -117,9 +121,14 @@ class GameView(arcade.View):  # pylint: disable=R0902
         """Arcade Draw Event."""
         self.clear()
         self.camera.use()  # type: ignore[no-untyped-call]
-        self.game_map.draw()  # type: ignore[no-untyped-call]
-        self.rpg_movement.draw()
-        self.registered_sprites.draw()
+        left, bottom = self.camera.position
+        width, height = self.window.width, self.window.height  # type: ignore[has-type]
+        self.game_map.update_view(left, bottom, width, height)
+        self.game_map.draw()
+        self.dynamic_sprites.update(
+            [*self.rpg_movement.sprites, *self.registered_sprites]
+        )
+        self.dynamic_sprites.draw()
         self.scroll_to_player()
 
         # Draw GUI
@@ -161,7 +170,7 @@ class GameView(arcade.View):  # pylint: disable=R0902
                 self.reload_modules()
             if key == arcade.key.Q and modifiers in meta_keys:  # pragma: no cover
                 logger.error("Received Keyboard Shortcut to Quit")
-                arcade.exit()  # type: ignore[no-untyped-call]
+                self.quit_game()
             if key == arcade.key.ESCAPE:
                 self.change_view_cb(PauseMenu)
             for register in self.get_all_registers():
@@ -246,6 +255,14 @@ class GameView(arcade.View):  # pylint: disable=R0902
         self.rpg_movement.setup_player_sprite(self.player_sprite)  # type: ignore[arg-type]
         self.rpg_movement.setup_registered_vehicle(self.registered_vehicle)  # type: ignore[arg-type]
         self.rpg_movement.setup_physics()
+        pack_textures(
+            [
+                *self.rpg_movement.sprites,
+                *self.registered_sprites,
+                *getattr(self.player_sprite, "inventory", []),
+            ],
+            self.game_map.sparkles.textures.values(),
+        )
 
     @beartype
     def on_update(self, delta_time: float) -> None:
@@ -262,6 +279,8 @@ class GameView(arcade.View):  # pylint: disable=R0902
                     register.on_update(game_clock)
                 if register.on_player_sprite_motion:
                     register.on_player_sprite_motion(player_center)
+            SPRITE_STATES.on_update(delta_time)
+            STATE_STORE.commit_in_background()
         except Exception as exc:  # pylint: disable=broad-except
             self.gui.draw_message_box(message=str(exc))
 
@@ -285,8 +304,22 @@ class GameView(arcade.View):  # pylint: disable=R0902
         )
         self.camera.move_to(vector, speed)
 
+    @beartype
+    def quit_game(self) -> None:
+        """Save the latest player state and wait for pending writes before exiting."""
+        if self.player_sprite:
+            self.state.save_player_data(  # type: ignore[unreachable]
+                self.player_sprite, self.rpg_movement.vehicle
+            )
+        SPRITE_STATES.flush()
+        SAVE_WORKER.flush()
+        STATE_STORE.commit()
+        arcade.exit()  # type: ignore[no-untyped-call]
+
     @beartype
     def restart(self) -> None:
+        SPRITE_STATES.flush()
+        STATE_STORE.commit()
         self.window.show_view(GameView(self.player_module, self.raft_module, self.code_modules))  # type: ignore[has-type]
 
     @beartype
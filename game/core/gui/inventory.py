@@ -7,6 +7,8 @@ from beartype import beartype
 
 from ..constants import MAX_INVENTORY_SIZE, SPRITE_SIZE
 from ..game_state import GameState
+from ..views.sprite_batch import SpriteBatch
+from ..views.spritesheets import load_spritesheet
 
 
 class InventoryGUI:
@@ -21,7 +23,7 @@ class InventoryGUI:
         self.state = state
         self.window_width = window_shape[0]
         numpad_key_id = 51  # Uses different indexing than 'arcade.key.KEY_1'
-        self.hotbar_sprite_list = arcade.load_spritesheet(
+        self.hotbar_sprite_list = load_spritesheet(
             file_name=":assets:maps/input_prompts_kenney.png",
             sprite_width=self._sprite_height,
             sprite_height=self._sprite_height,
@@ -29,6 +31,10 @@ class InventoryGUI:
             count=816,
             margin=1,
         )[numpad_key_id : numpad_key_id + self.capacity]
+        # Slot sprites are batched instead of drawing each texture on its own
+        self.hotkey_sprites: arcade.SpriteList | None = None
+        self.item_icons = SpriteBatch()
+        self._icons: dict[tuple[int, str], arcade.Sprite] = {}
 
     @beartype
     def draw(self, activated_item_index: int | None) -> None:
@@ -46,7 +52,22 @@ class InventoryGUI:
             arcade.color.ALMOND,
         )
 
+        if self.hotkey_sprites is None:
+            self.hotkey_sprites = arcade.SpriteList()
+            for idx, texture in enumerate(self.hotbar_sprite_list):
+                x_center = idx * field_width + 5
+                self.hotkey_sprites.append(
+                    arcade.Sprite(
+                        texture=texture,
+                        scale=2.0,
+                        center_x=x_center + self._sprite_height / 2 + 20,
+                        center_y=y_mid + self._sprite_height / 2,
+                    )
+                )
+        self.hotkey_sprites.draw()  # type: ignore[no-untyped-call]
+
         # Draw each slot
+        icons = []
         inventory = self.state.inventory
         for idx, item in zip_longest(range(self.capacity), inventory):
             x_center = idx * field_width + 5
@@ -60,13 +81,6 @@ class InventoryGUI:
                     2,
                 )
 
-            hotkey_sprite = self.hotbar_sprite_list[idx]
-            hotkey_sprite.draw_scaled(
-                x_center + self._sprite_height / 2 + 20,
-                y_mid + self._sprite_height / 2,
-                2.0,
-            )
-
             # Draw item in slot
             if item:
                 text = item.properties["name"]
@@ -80,10 +94,12 @@ class InventoryGUI:
                     arcade.color.ALLOY_ORANGE,
                     12,
                 )
-                arcade.draw_lrwh_rectangle_textured(
-                    x_center + SPRITE_SIZE + 20,
-                    y_mid,
-                    SPRITE_SIZE,
-                    SPRITE_SIZE,
-                    item.texture,
-                )
+                key = (idx, item.texture.name)
+                if not (icon := self._icons.get(key)):
+                    icon = self._icons[key] = arcade.Sprite(texture=item.texture)
+                    icon.width = icon.height = SPRITE_SIZE
+                    icon.left = x_center + SPRITE_SIZE + 20
+                    icon.bottom = y_mid
+                icons.append(icon)
+        self.item_icons.update(icons)
+        self.item_icons.draw()
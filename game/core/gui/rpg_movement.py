@@ -11,6 +11,7 @@ from ..end_game_menu import EndGameMenu
 from ..game_clock import GameClock
 from ..game_map import GameMap
 from ..game_state import GameState
+from ..occupancy_grid import OccupancyPhysicsEngine
 from ..pressed_keys import PressedKeys
 from ..registration import Register
 from ..view_strategies.raft_utils import (
@@ -80,17 +81,19 @@ class RPGMovement:
 
     @beartype
     def setup_physics(self) -> None:
-        self.physics_engine = arcade.PhysicsEngineSimple(
-            self.player_sprite, self.game_map.scene["wall_list"]  # type: ignore[arg-type]
+        self.physics_engine = OccupancyPhysicsEngine(
+            self.player_sprite, self.game_map.grid  # type: ignore[arg-type]
         )
 
+    @property
     @beartype
-    def draw(self) -> None:
-        if self.vehicle:
-            self.vehicle.draw()
-        self.player_sprite.draw()
+    def sprites(self) -> list[arcade.Sprite]:
+        """Sprites to draw from back to front."""
+        sprites: list[arcade.Sprite] = [self.vehicle] if self.vehicle else []
+        sprites.append(self.player_sprite)  # type: ignore[arg-type]
         if self.player_sprite.item:
-            self.player_sprite.item.draw()
+            sprites.append(self.player_sprite.item)
+        return sprites
 
     @beartype
     def on_update(self) -> None:
@@ -102,7 +105,9 @@ class RPGMovement:
 
         # Call update to move the sprite
         if self.physics_engine:
-            self.physics_engine.update()  # type: ignore[no-untyped-call]
+            # Follow the active collision profile after boarding or docking
+            self.physics_engine.grid = self.game_map.grid
+            self.physics_engine.update()
 
         # Update player animation
         self.player_sprite.on_update()
@@ -152,22 +157,24 @@ class RPGMovement:
     @beartype
     def search(self) -> None:
         """Picks up any item that user collides with."""
-        if searchable_sprites := self.game_map.map_layers.get("searchable"):
-            sprites_in_range = arcade.check_for_collision_with_list(
-                self.player_sprite, searchable_sprites  # type: ignore[arg-type]
-            )
-            for sprite in sprites_in_range or []:
-                if item_name := sprite.properties.get("name"):
-                    try:
-                        key = self.player_sprite.add_item_to_inventory(sprite)
-                    except Exception as exc:  # pylint: disable=broad-except
-                        self.gui.draw_message_box(message=str(exc))
-                        return
-                    self.gui.draw_message_box(
-                        message=f"{item_name} added to inventory!",
-                        notes=f"Press {key} to use",
-                    )
-                    self.game_map.remove_sprite(sprite, searchable=True)
+        player = self.player_sprite
+        nearby = self.game_map.spatial_index.in_rect(
+            "searchable", player.left, player.bottom, player.right, player.top
+        )
+        for sprite in nearby:
+            if not arcade.check_for_collision(player, sprite):  # type: ignore[arg-type]
+                continue
+            if item_name := sprite.properties.get("name"):
+                try:
+                    key = self.player_sprite.add_item_to_inventory(sprite)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.gui.draw_message_box(message=str(exc))
+                    return
+                self.gui.draw_message_box(
+                    message=f"{item_name} added to inventory!",
+                    notes=f"Press {key} to use",
+                )
+                self.game_map.remove_sprite(sprite, searchable=True)
 
     @beartype
     def use_item(self, slot: int) -> None:
@@ -233,14 +240,14 @@ class RPGMovement:
 
     @beartype
     def handle_mouse_press_item(self) -> None:
-        closest = arcade.get_closest_sprite(
-            self.player_sprite, self.game_map.map_layers["interactables_blocking"]  # type: ignore[arg-type]
+        closest = self.game_map.spatial_index.nearest(
+            "interactables_blocking",
+            self.player_sprite.center_x,
+            self.player_sprite.center_y,
+            max_distance=constants.SPRITE_SIZE * 2,
         )
-        if not closest:
-            return
-        (sprite, dist) = closest
-        if dist < constants.SPRITE_SIZE * 2:
-            self.item_target = sprite
+        if closest:
+            self.item_target = closest[0][0]
             self.animate = True
         else:
             self.gui.draw_message_box(
@@ -258,16 +265,15 @@ class RPGMovement:
 
     @beartype
     def handle_mouse_press_dock_raft(self) -> None:
-        sprites_colliding = arcade.check_for_collision_with_list(
-            self.vehicle, self.game_map.scene["wall_list"]  # type: ignore[arg-type]
-        )
         # First, check if raft is touching shore (otherwise player cannot get on raft)
-        if len(sprites_colliding):
+        closest = None
+        player = self.player_sprite
+        if player and self.game_map.can_dock(self.vehicle):  # type: ignore[arg-type]
             # Then, find closest land to move player to
-            (sprite, _) = arcade.get_closest_sprite(
-                self.player_sprite, self.game_map.scene["wall_list"]  # type: ignore[arg-type]
-            )
-            dock_raft(self.vehicle, self.player_sprite, self.game_map, sprite)
+            closest = self.game_map.closest_land_coordinates(player)
+        if closest:
+            (position, _) = closest
+            dock_raft(self.vehicle, self.player_sprite, self.game_map, position)
             self.gui.draw_message_box(
                 message="Docked raft",
                 notes="Left click while close to the raft to board again",
@@ -0,0 +1,63 @@
+"""Loading screen shown while the assets are decoded."""
+
+from collections.abc import Callable
+
+import arcade
+from beartype import beartype
+
+from .asset_cache import add_resource_handles
+from .asset_preloader import AssetPreloader
+
+
+class LoadingView(arcade.View):
+    """Show the progress of the preloader, then the view that it was loading for.
+
+    The view is created on the main thread once every asset is decoded, so the window
+    keeps responding until then.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        create_view: Callable[[], arcade.View],
+        preloader: AssetPreloader | None = None,
+    ) -> None:
+        super().__init__()
+        add_resource_handles()
+        self.create_view = create_view
+        self.preloader = preloader or AssetPreloader()
+        self.progress = 0.0
+
+    @beartype
+    def on_update(self, delta_time: float) -> None:
+        """Collect the decoded assets, then switch once a full frame was drawn."""
+        if self.preloader.finished and self.progress == 1:
+            self.window.show_view(self.create_view())  # type: ignore[has-type]
+            return
+        self.progress = self.preloader.poll()
+
+    @beartype
+    def on_draw(self) -> None:
+        self.clear()
+        width, height = self.window.width, self.window.height  # type: ignore[has-type]
+        bar_width = width / 2
+        left, bottom = (width - bar_width) / 2, height / 2 - 10
+        arcade.draw_lrtb_rectangle_filled(
+            left,
+            left + bar_width * self.progress,
+            bottom + 20,
+            bottom,
+            arcade.color.ALLOY_ORANGE,
+        )
+        arcade.draw_lrtb_rectangle_outline(
+            left, left + bar_width, bottom + 20, bottom, arcade.color.ALMOND, 2
+        )
+        arcade.draw_text(
+            f"Loading... {self.progress:.0%}",
+            width / 2,
+            bottom + 40,
+            arcade.color.ALMOND,
+            16,
+            anchor_x="center",
+        )
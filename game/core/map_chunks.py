@@ -0,0 +1,265 @@
+"""Tile layers streamed in square chunks around the camera.
+
+Only the gid arrays are kept for the whole map. A vertex buffer is built from them for
+the chunks near the camera and the least recently used chunks are released, so memory
+follows what is on screen instead of the size of the map. Layers that never change and
+have no animated tiles are baked into a texture per chunk, so they cost one quad per
+chunk to draw.
+
+"""
+
+import math
+from collections import OrderedDict
+from collections.abc import Collection
+
+import arcade
+import numpy as np
+import numpy.typing as npt
+from arcade.gl import Program
+from arcade.gl.geometry import quad_2d
+from beartype import beartype
+from pyglet import gl
+
+from .constants import MAP_CHUNK_BUDGET, MAP_CHUNK_SIZE, NumT
+from .tile_layers import TileLayers
+from .tile_renderer import TileAtlas, TileGeometry, build_tile_vertices
+
+ChunkT = tuple[int, int]
+
+_BAKED_VERTEX_SHADER = """
+#version 330
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = proj.matrix * vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+_BAKED_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D baked;
+in vec2 uv;
+out vec4 f_color;
+void main() {
+    f_color = texture(baked, uv);
+}
+"""
+
+
+class BakedChunk:
+    """Static layers of one chunk rendered once to a texture with premultiplied alpha.
+
+    Arcade only blends colors and alpha together, so the colors are drawn first with
+    the default blending, then the alpha channel alone is drawn again over zero.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        ctx: arcade.ArcadeContext,
+        rect: tuple[int, int, int, int],
+        drawables: list[arcade.SpriteList | TileGeometry],
+    ) -> None:
+        left, bottom, width, height = rect
+        self.texture = ctx.texture(
+            (width, height), components=4, filter=(ctx.NEAREST, ctx.NEAREST)
+        )
+        framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        projection = ctx.projection_2d_matrix
+        try:
+            with framebuffer.activate():
+                ctx.projection_2d = (left, left + width, bottom, bottom + height)
+                framebuffer.clear()
+                for drawable in drawables:
+                    drawable.draw()
+                gl.glColorMask(False, False, False, True)
+                framebuffer.clear()
+                for drawable in drawables:
+                    drawable.draw(blend_function=(ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA))
+        finally:
+            gl.glColorMask(True, True, True, True)
+            ctx.projection_2d_matrix = projection
+        self.geometry = quad_2d(
+            (width, height), (left + width / 2, bottom + height / 2)
+        )
+
+    @beartype
+    def draw(self, program: Program) -> None:
+        self.texture.use(0)
+        self.geometry.render(program)
+
+
+class MapChunks:
+    """Vertex buffers of the streamed layers for the chunks that were recently in view.
+
+    The `static_layers` are baked into one texture per chunk instead of drawing a
+    vertex per tile. Layers with animated tiles are streamed even when listed, since
+    a baked texture would freeze them. Chunks are counted from the bottom left of the
+    map.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        tile_layers: TileLayers,
+        layer_names: list[str],
+        chunk_tiles: int = MAP_CHUNK_SIZE,
+        budget: int = MAP_CHUNK_BUDGET,
+        static_layers: Collection[str] = (),
+    ) -> None:
+        self.tile_layers = tile_layers
+        self.tile_atlas = TileAtlas(tile_layers)
+        self.layer_names = layer_names
+        # Consecutive static layers are baked together without changing the order
+        self.passes: list[tuple[bool, list[str]]] = []
+        for name in self.layer_names:
+            is_static = name in static_layers and not tile_layers.is_animated(name)
+            if is_static and self.passes and self.passes[-1][0]:
+                self.passes[-1][1].append(name)
+            else:
+                self.passes.append((is_static, [name]))
+        self._program: Program | None = None
+        self.chunk_tiles = chunk_tiles
+        tile_width, tile_height = tile_layers.tile_size
+        self.chunk_width = chunk_tiles * tile_width
+        self.chunk_height = chunk_tiles * tile_height
+        # Baked chunks also draw the large tiles of their neighbors that overhang them
+        max_width, max_height = tile_layers.max_tile_size
+        self.overhang = (
+            math.ceil(max_width / tile_width) - 1,
+            math.ceil(max_height / tile_height) - 1,
+        )
+        rows, columns = tile_layers.shape
+        self.grid_size = (
+            math.ceil(columns / chunk_tiles),
+            math.ceil(rows / chunk_tiles),
+        )
+        self.occupied = {name: self._get_occupied(name) for name in self.layer_names}
+        self.budget = budget
+        self.loaded: OrderedDict[
+            ChunkT, list[TileGeometry | BakedChunk | None]
+        ] = OrderedDict()
+        self.visible: list[ChunkT] = []
+        self.totals = {
+            name: int(occupied.sum()) for name, occupied in self.occupied.items()
+        }
+        self.counts: dict[str, tuple[int, int]] = {}
+        """Number of submitted and culled chunks for each layer."""
+
+    @beartype
+    def _get_occupied(self, name: str) -> npt.NDArray[np.bool_]:
+        """Return which chunks have a tile of the layer, indexed by column and row."""
+        size = self.chunk_tiles
+        columns, rows = self.grid_size
+        mask = np.zeros((rows * size, columns * size), dtype=np.bool_)
+        layer = self.tile_layers[name]
+        # Flip the Tiled rows to count chunks from the bottom of the map
+        mask[: layer.shape[0], : layer.shape[1]] = layer[::-1] != 0
+        occupied: npt.NDArray[np.bool_] = (
+            mask.reshape(rows, size, columns, size).any(axis=(1, 3)).T
+        )
+        return occupied
+
+    @beartype
+    def get_chunk(self, x: NumT, y: NumT) -> ChunkT:
+        return math.floor(x / self.chunk_width), math.floor(y / self.chunk_height)
+
+    @beartype
+    def _get_cells(
+        self, key: ChunkT, overhang: tuple[int, int] = (0, 0)
+    ) -> tuple[tuple[int, int], tuple[int, int]]:
+        """Return the Tiled rows and the columns of the chunk, extended left and down."""
+        rows, columns = self.tile_layers.shape
+        size = self.chunk_tiles
+        column, row = key
+        top = rows - (row + 1) * size
+        bottom = rows - row * size + overhang[1]
+        left = column * size - overhang[0]
+        right = (column + 1) * size
+        return (
+            (max(top, 0), min(bottom, rows)),
+            (max(left, 0), min(right, columns)),
+        )
+
+    @beartype
+    def _load(self, key: ChunkT) -> list[TileGeometry | BakedChunk | None]:
+        """Build the vertices of each pass, baking the static ones."""
+        ctx = arcade.get_window().ctx
+        rect = (
+            key[0] * self.chunk_width,
+            key[1] * self.chunk_height,
+            self.chunk_width,
+            self.chunk_height,
+        )
+        loaded: list[TileGeometry | BakedChunk | None] = []
+        for is_static, names in self.passes:
+            overhang = self.overhang if is_static else (0, 0)
+            rows, columns = self._get_cells(key, overhang)
+            vertices = build_tile_vertices(self.tile_atlas, names, rows, columns)
+            if not len(vertices):
+                loaded.append(None)
+            elif is_static:
+                geometry = TileGeometry(ctx, vertices, self.tile_atlas)
+                loaded.append(BakedChunk(ctx, rect, [geometry]))
+            else:
+                loaded.append(TileGeometry(ctx, vertices, self.tile_atlas))
+        return loaded
+
+    @beartype
+    def update(self, left: NumT, bottom: NumT, width: NumT, height: NumT) -> None:
+        """Load the chunks in and around the view, then evict beyond the budget."""
+        columns, rows = self.grid_size
+        min_col, min_row = self.get_chunk(left, bottom)
+        max_col, max_row = self.get_chunk(left + width, bottom + height)
+        self.visible = [
+            (col, row)
+            for col in range(max(min_col, 0), min(max_col + 1, columns))
+            for row in range(max(min_row, 0), min(max_row + 1, rows))
+        ]
+        # Include one chunk of margin to load before the camera reaches them
+        nearby = [
+            (col, row)
+            for col in range(max(min_col - 1, 0), min(max_col + 2, columns))
+            for row in range(max(min_row - 1, 0), min(max_row + 2, rows))
+        ]
+        for key in nearby:
+            if key not in self.loaded:
+                self.loaded[key] = self._load(key)
+            self.loaded.move_to_end(key)
+        while len(self.loaded) > max(self.budget, len(nearby)):
+            self.loaded.popitem(last=False)
+        for name, total in self.totals.items():
+            occupied = self.occupied[name]
+            submitted = sum(1 for key in self.visible if occupied[key])
+            self.counts[name] = (submitted, total - submitted)
+
+    @beartype
+    def draw(self, time: NumT = 0) -> None:
+        """Draw each pass across the visible chunks to keep the layer order.
+
+        `time` is the game time in milliseconds for the animated tiles.
+
+        """
+        ctx = arcade.get_window().ctx
+        for index in range(len(self.passes)):
+            for key in self.visible:
+                item = self.loaded[key][index]
+                if isinstance(item, BakedChunk):
+                    if self._program is None:
+                        self._program = ctx.program(
+                            vertex_shader=_BAKED_VERTEX_SHADER,
+                            fragment_shader=_BAKED_FRAGMENT_SHADER,
+                        )
+                    ctx.enable(ctx.BLEND)  # type: ignore[no-untyped-call]
+                    ctx.blend_func = ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA
+                    item.draw(self._program)
+                elif item:
+                    item.draw(time=time)
+        ctx.blend_func = ctx.BLEND_DEFAULT
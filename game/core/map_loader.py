@@ -0,0 +1,154 @@
+"""Single parse of the Tiled map shared by the game state and the scene."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import arcade
+from beartype import beartype
+from loguru import logger
+from pytiled_parser.common_types import OrderedPair, Size
+from pytiled_parser.parsers.json.layer import parse as parse_layer
+from pytiled_parser.parsers.json.properties import parse as parse_properties
+from pytiled_parser.parsers.json.tileset import parse as parse_json_tileset
+from pytiled_parser.tiled_map import TiledMap
+from pytiled_parser.util import parse_color
+
+from .compiled_map import CompiledTileMap, LayerOptionsT, load_compiled_tilemap
+from .constants import MAP, MAP_CACHE_DIR
+from .models.map_delta import MapDelta, TileMapT
+from .models.object_index import MapObjectIndex
+from .tile_layers import TileLayers, get_map_hash, load_tile_layers
+
+MAP_LAYER_OPTIONS: LayerOptionsT = {
+    "ground": {
+        "use_spatial_hash": True,
+    },
+    "coast_background": {
+        "use_spatial_hash": True,
+    },
+    "water_blocking": {
+        "use_spatial_hash": True,
+    },
+    "coast_foreground": {
+        "use_spatial_hash": True,
+    },
+    "decorations_nonblocking": {
+        "use_spatial_hash": True,
+    },
+    "trees_blocking": {
+        "use_spatial_hash": True,
+    },
+    "misc_blocking": {
+        "use_spatial_hash": True,
+    },
+    "bridges": {
+        "use_spatial_hash": True,
+    },
+    "searchable": {
+        "use_spatial_hash": True,
+    },
+    "interactables_blocking": {
+        "use_spatial_hash": True,
+    },
+}
+"""Arcade options for the layers that are part of a collision profile."""
+
+MAP_STATIC_LAYERS = (
+    "ground",
+    "coast_background",
+    "coast_foreground",
+    "decorations_nonblocking",
+    "trees_blocking",
+)
+"""Tile layers that never change and are baked into the textures of each chunk."""
+
+
+@beartype
+def parse_tiled_map(raw_map: TileMapT, map_file: Path) -> TiledMap:
+    """Build the `pytiled_parser` map from JSON that was already parsed.
+
+    Mirrors `pytiled_parser.parse_map` for JSON maps with JSON tilesets.
+
+    """
+    parent_dir = map_file.parent
+    tilesets = {}
+    for raw_tileset in raw_map["tilesets"]:
+        first_gid = raw_tileset["firstgid"]
+        if source := raw_tileset.get("source"):
+            tileset_path = parent_dir / source
+            tilesets[first_gid] = parse_json_tileset(
+                json.loads(tileset_path.read_text()),
+                first_gid,
+                external_path=tileset_path.parent,
+            )
+        else:
+            tilesets[first_gid] = parse_json_tileset(raw_tileset, first_gid)
+
+    tiled_map = TiledMap(
+        map_file=map_file,
+        infinite=raw_map["infinite"],
+        layers=[parse_layer(layer, parent_dir) for layer in raw_map["layers"]],
+        map_size=Size(raw_map["width"], raw_map["height"]),
+        next_layer_id=raw_map["nextlayerid"],
+        next_object_id=raw_map["nextobjectid"],
+        orientation=raw_map["orientation"],
+        render_order=raw_map["renderorder"],
+        tiled_version=raw_map["tiledversion"],
+        tile_size=Size(raw_map["tilewidth"], raw_map["tileheight"]),
+        tilesets=tilesets,
+        version=str(raw_map["version"]),
+    )
+    if background_color := raw_map.get("backgroundcolor"):
+        tiled_map.background_color = parse_color(background_color)
+    if properties := raw_map.get("properties"):
+        tiled_map.properties = parse_properties(properties)
+    tiled_map.parallax_origin = OrderedPair(
+        raw_map.get("parallaxoriginx", 0), raw_map.get("parallaxoriginy", 0)
+    )
+    return tiled_map
+
+
+class LoadedMap:
+    """Results of loading the map. The raw JSON is not retained."""
+
+    @beartype
+    def __init__(
+        self,
+        scene_map: arcade.TileMap | CompiledTileMap,
+        map_objects: MapObjectIndex,
+        tile_layers: TileLayers,
+    ) -> None:
+        self.scene_map = scene_map
+        self.map_objects = map_objects
+        self.tile_layers = tile_layers
+
+
+@beartype
+def load_map(
+    map_delta: MapDelta,
+    map_path: Path = MAP,
+    layer_options: LayerOptionsT = MAP_LAYER_OPTIONS,
+    cache_root: Path = MAP_CACHE_DIR,
+) -> LoadedMap:
+    """Read and parse the map file once for the scene, tile arrays, and objects."""
+    logger.debug(f"Loading map: {map_path}")
+    raw_bytes = map_path.read_bytes()
+    raw_map: dict[str, Any] = json.loads(raw_bytes)
+    map_hash = get_map_hash(map_path, raw_bytes, raw_map)
+
+    tile_layers = load_tile_layers(
+        map_path, cache_root, tile_map=raw_map, map_hash=map_hash
+    )
+    # The scene is built from the pristine map. Drops are added as sprites later
+    scene_map = load_compiled_tilemap(
+        map_path,
+        layer_options,
+        cache_root,
+        map_hash=map_hash,
+        parse_map=lambda: parse_tiled_map(raw_map, map_path),
+        streamed_layers=[*tile_layers.layers],
+    )
+    map_delta.replay(raw_map)
+    map_objects = MapObjectIndex(raw_map, map_dir=map_path.parent)
+    return LoadedMap(scene_map, map_objects, tile_layers)
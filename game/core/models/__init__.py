@@ -1,4 +1,5 @@
 """Model component of the MVP architecture."""
 
 from .entity_attr import EntityAttr  # noqa: F401
+from .map_delta import MapDelta  # noqa: F401
 from .sprite_state import SpriteState  # noqa: F401
@@ -0,0 +1,168 @@
+"""Map mutations persisted as an append-only log of records."""
+
+from typing import Any
+
+from beartype import beartype
+from loguru import logger
+from pydantic import BaseModel, Field, PrivateAttr  # pylint: disable=E0611
+
+from ..constants import NumT
+from ..state_store import STATE_STORE, StateStore
+
+TileMapT = dict[str, Any]
+TiledObjectT = dict[str, Any]
+
+
+@beartype
+def get_object_id(obj: TiledObjectT) -> str | None:
+    """Return the custom 'id' property used to identify Tiled objects in game."""
+    for prop in obj.get("properties", []):
+        if prop["name"] == "id":
+            return prop["value"]  # type: ignore[no-any-return]
+    return None
+
+
+class MapDelta(BaseModel):
+    """Mutations applied to the map since it was first loaded.
+
+    Each mutation is appended to the `StateStore` as a single record, so a pickup is
+    a small constant-size write. On load, the records are replayed over the pristine
+    map.
+
+    """
+
+    removed_ids: set[str] = Field(default_factory=set)
+    """Custom 'id' property of every removed object."""
+
+    drops: list[dict[str, Any]] = Field(default_factory=list)
+    """Spawned objects with their layer, Tiled object, and sprite center."""
+
+    tilesets: list[dict[str, Any]] = Field(default_factory=list)
+    """Tileset references appended to the map for the spawned objects."""
+
+    _store: StateStore = PrivateAttr(default_factory=lambda: STATE_STORE)
+
+    @classmethod
+    @beartype
+    def load(cls, store: StateStore = STATE_STORE) -> "MapDelta":
+        """Replay the records saved in the store."""
+        delta = cls()
+        delta._store = store
+        for record in store.map_records:
+            delta.apply_record(record)
+        return delta
+
+    @classmethod
+    @beartype
+    def from_legacy_save(
+        cls, pristine: TileMapT, saved: TileMapT, store: StateStore = STATE_STORE
+    ) -> "MapDelta":
+        """Compute the mutations between the pristine map and a legacy full save."""
+        delta = cls()
+        delta._store = store
+        map_height = pristine["height"] * pristine["tileheight"]
+        pristine_layers = {layer["name"]: layer for layer in pristine["layers"]}
+        for layer in saved["layers"]:
+            if layer["type"] != "objectgroup":
+                continue
+            pristine_objects = pristine_layers.get(layer["name"], {}).get("objects", [])
+            pristine_ids = {get_object_id(obj) for obj in pristine_objects}
+            saved_ids = {get_object_id(obj) for obj in layer["objects"]}
+            for object_id in pristine_ids - saved_ids:
+                if object_id:
+                    delta.record_removal(layer["name"], object_id)
+            for obj in layer["objects"]:
+                if get_object_id(obj) not in pristine_ids:
+                    center = (
+                        obj["x"] + obj["width"] / 2,
+                        map_height - obj["y"] + obj["height"] / 2,
+                    )
+                    delta.record_drop(layer["name"], obj, center)
+        known_tilesets = {tileset["source"] for tileset in pristine["tilesets"]}
+        for tileset in saved["tilesets"]:
+            if tileset.get("source") not in known_tilesets:
+                delta.record_tileset(tileset)
+        return delta
+
+    @beartype
+    def apply_record(self, record: dict[str, Any]) -> None:
+        """Apply a single mutation to the in-memory state."""
+        if record["op"] == "remove":
+            self.removed_ids.add(record["id"])
+        elif record["op"] == "drop":
+            self.drops.append(
+                {
+                    "layer": record["layer"],
+                    "object": record["object"],
+                    "center": record["center"],
+                }
+            )
+        elif record["op"] == "tileset":
+            self.tilesets.append(record["tileset"])
+        else:
+            logger.warning(f"Unknown map mutation: {record}")
+
+    @beartype
+    def record_removal(self, layer: str, object_id: str) -> None:
+        self._append({"op": "remove", "layer": layer, "id": object_id})
+
+    @beartype
+    def record_drop(
+        self, layer: str, obj: TiledObjectT, center: tuple[NumT, NumT]
+    ) -> None:
+        self._append({"op": "drop", "layer": layer, "object": obj, "center": [*center]})
+
+    @beartype
+    def record_tileset(self, tileset: dict[str, Any]) -> None:
+        self._append({"op": "tileset", "tileset": tileset})
+
+    @property
+    @beartype
+    def live_drops(self) -> list[dict[str, Any]]:
+        """Spawned objects that have not since been removed."""
+        return [
+            drop
+            for drop in self.drops
+            if get_object_id(drop["object"]) not in self.removed_ids
+        ]
+
+    @beartype
+    def replay(self, tile_map: TileMapT) -> None:
+        """Apply all mutations to the raw map data loaded from the pristine map."""
+        # Older saves listed the tileset once per drop, so share the first entry
+        first_gids: dict[str | None, int] = {}
+        for tileset in tile_map["tilesets"]:
+            first_gids.setdefault(tileset.get("source"), tileset["firstgid"])
+        shared_gids: dict[int, int] = {}
+        for tileset in self.tilesets:
+            source = tileset.get("source")
+            if source in first_gids:
+                shared_gids[tileset["firstgid"]] = first_gids[source]
+            else:
+                first_gids[source] = tileset["firstgid"]
+                tile_map["tilesets"].append(tileset)
+
+        layers = {layer["name"]: layer for layer in tile_map["layers"]}
+        for drop in self.drops:
+            if layer := layers.get(drop["layer"]):
+                obj = drop["object"]
+                if obj.get("gid") in shared_gids:
+                    obj = {**obj, "gid": shared_gids[obj["gid"]]}
+                layer["objects"].append(obj)
+        for layer in layers.values():
+            if layer["type"] == "objectgroup":
+                layer["objects"] = [
+                    obj
+                    for obj in layer["objects"]
+                    if get_object_id(obj) not in self.removed_ids
+                ]
+        # Never reuse the Tiled id of a spawned object, even if since removed
+        tile_map["nextobjectid"] = max(
+            [tile_map.get("nextobjectid", 1)]
+            + [drop["object"]["id"] + 1 for drop in self.drops]
+        )
+
+    @beartype
+    def _append(self, record: dict[str, Any]) -> None:
+        self.apply_record(record)
+        self._store.append_map_record(record)
@@ -0,0 +1,128 @@
+"""Index of the objects in the Tiled object layers."""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from beartype import beartype
+
+from ..constants import MAP
+from .map_delta import TiledObjectT, TileMapT, get_object_id
+
+INDEXED_LAYERS = ("searchable", "interactables_blocking")
+"""Object layers that can be mutated while playing."""
+
+
+@lru_cache(maxsize=None)
+@beartype
+def get_tileset_tile_count(source: Path) -> int:
+    """Read the number of tiles in an external tileset."""
+    return json.loads(source.read_text())["tilecount"]  # type: ignore[no-any-return]
+
+
+class ObjectLayerIndex:
+    """Lookup of a single object layer by the custom 'id' property."""
+
+    @beartype
+    def __init__(self, layer: dict[str, Any]) -> None:
+        self.name: str = layer["name"]
+        self.objects: dict[str, TiledObjectT] = {}
+        for obj in layer["objects"]:
+            if object_id := get_object_id(obj):
+                self.objects[object_id] = obj
+
+    @beartype
+    def get(self, object_id: str) -> TiledObjectT | None:
+        return self.objects.get(object_id)
+
+    @beartype
+    def pop(self, object_id: str) -> TiledObjectT | None:
+        return self.objects.pop(object_id, None)
+
+    @beartype
+    def add(self, obj: TiledObjectT) -> None:
+        if object_id := get_object_id(obj):
+            self.objects[object_id] = obj
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+
+class MapObjectIndex:
+    """Index the mutable object layers and allocate unique Tiled ids and gids."""
+
+    @beartype
+    def __init__(
+        self,
+        tile_map: TileMapT,
+        map_dir: Path = MAP.parent,
+        layer_names: tuple[str, ...] = INDEXED_LAYERS,
+    ) -> None:
+        self.map_dir = map_dir
+        self.layers = {
+            layer["name"]: ObjectLayerIndex(layer)
+            for layer in tile_map["layers"]
+            if layer["type"] == "objectgroup" and layer["name"] in layer_names
+        }
+        object_ids = [
+            obj["id"]
+            for layer in tile_map["layers"]
+            for obj in layer.get("objects", [])
+        ]
+        self._next_object_id: int = max(
+            tile_map.get("nextobjectid", 1), max(object_ids, default=0) + 1
+        )
+        self._next_gid = max(
+            (self._get_last_gid(tileset) for tileset in tile_map["tilesets"]),
+            default=0,
+        )
+        self.first_gids: dict[str, int] = {}
+        """Shared 'firstgid' of each external tileset by source."""
+        for tileset in tile_map["tilesets"]:
+            if source := tileset.get("source"):
+                self.first_gids.setdefault(source, tileset["firstgid"])
+
+    @beartype
+    def __getitem__(self, layer_name: str) -> ObjectLayerIndex:
+        return self.layers[layer_name]
+
+    @beartype
+    def allocate_object_id(self) -> int:
+        """Return a Tiled object id that is unused in this map."""
+        object_id = self._next_object_id
+        self._next_object_id += 1
+        return object_id
+
+    @beartype
+    def allocate_gids(self, tile_count: int = 1) -> int:
+        """Reserve a range of gids for a new tileset and return the 'firstgid'."""
+        first_gid = self._next_gid + 1
+        self._next_gid += tile_count
+        return first_gid
+
+    @beartype
+    def add_tileset(self, source: str) -> dict[str, Any] | None:
+        """Register the external tileset once and return the new map entry.
+
+        Returns `None` when the tileset is already part of the map, so every drop of
+        the same item shares a single tileset and gid range.
+
+        """
+        if source in self.first_gids:
+            return None
+        first_gid = self.allocate_gids(self.get_tile_count(source))
+        self.first_gids[source] = first_gid
+        return {"firstgid": first_gid, "source": source}
+
+    @beartype
+    def get_tile_count(self, source: str) -> int:
+        return get_tileset_tile_count(self.map_dir / source)
+
+    @beartype
+    def _get_last_gid(self, tileset: dict[str, Any]) -> int:
+        if "tilecount" in tileset:
+            tile_count = tileset["tilecount"]
+        else:
+            tile_count = self.get_tile_count(tileset["source"])
+        return tileset["firstgid"] + tile_count - 1  # type: ignore[no-any-return]
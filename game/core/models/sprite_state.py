@@ -1,16 +1,16 @@
 """Generic Sprite State."""
 
+import atexit
 import json
-import re
 from contextlib import suppress
 from enum import Enum
-from pathlib import Path
 from typing import Literal
 
 from beartype import beartype
 from pydantic import BaseModel  # pylint: disable=E0611
 
-from ..constants import PLAYER_SAVE_FILE, STARTING_X, STARTING_Y
+from ..constants import SPRITE_STATE_FLUSH_INTERVAL, STARTING_X, STARTING_Y
+from ..state_store import STATE_STORE, StateStore
 
 
 class Direction(Enum):
@@ -55,23 +55,75 @@ class SpriteState(BaseModel):
         if self.cur_texture_index not in self.direction.value:
             self.cur_texture_index = self.direction.value[0]
 
-    @property
-    @beartype
-    def state_path(self) -> Path:
-        name = re.sub(r"[:/ ]", "-", self.state_name)
-        return PLAYER_SAVE_FILE.parent / f".save-{name}.json"
-
     @beartype
     def load_state(self) -> "SpriteState":
-        if self.state_path.is_file():
+        SPRITE_STATES.flush()
+        if data := SPRITE_STATES.store.get_sprite_state(self.state_name):
             with suppress(Exception):
-                kwargs = json.loads(self.state_path.read_text())
-                return SpriteState(**kwargs)
+                return SpriteState(**json.loads(data))
         return self
 
     @beartype
     def save_state(self) -> None:
-        self.state_path.write_text(self.json())
+        """Mark the state as dirty. The state is saved on the next batch flush."""
+        SPRITE_STATES.mark_dirty(self)
+
+
+class SpriteStateBatch:
+    """Dirty sprite states that are written together on an interval.
+
+    Moving sprites only mark their state as dirty. The snapshots are serialized and
+    handed to the `StateStore` once per interval, on view changes, and on exit.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        interval: float = SPRITE_STATE_FLUSH_INTERVAL,
+        store: StateStore = STATE_STORE,
+    ) -> None:
+        self.interval = interval
+        self.store = store
+        self.elapsed = 0.0
+        self._dirty: dict[str, SpriteState] = {}
+
+    @beartype
+    def mark_dirty(self, state: SpriteState) -> None:
+        self._dirty[state.state_name] = state
+
+    @property
+    @beartype
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    @beartype
+    def on_update(self, delta_time: float) -> None:
+        self.elapsed += delta_time
+        if self.elapsed >= self.interval:
+            self.flush()
+
+    @beartype
+    def flush(self) -> None:
+        """Stage a snapshot of every dirty state that changed since the last flush."""
+        self.elapsed = 0.0
+        dirty, self._dirty = self._dirty, {}
+        for name, state in dirty.items():
+            data = state.json()
+            if self.store.get_sprite_state(name) != data:
+                self.store.set_sprite_state(name, data)
+
+    @beartype
+    def clear(self) -> None:
+        """Drop any unsaved changes, such as when the saved data is removed."""
+        self.elapsed = 0.0
+        self._dirty = {}
+
+
+SPRITE_STATES = SpriteStateBatch()
+"""Process-wide batch of sprite states. Flushed before the `STATE_STORE` on exit."""
+
+atexit.register(SPRITE_STATES.flush)
 
 
 class PlayerState(SpriteState):
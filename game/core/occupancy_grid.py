@@ -0,0 +1,164 @@
+"""Tile occupancy grids for player movement.
+
+The map is a regular grid, so whether a box is blocked is answered by slicing the
+cells under it instead of testing the player against every nearby wall sprite.
+
+"""
+
+import math
+
+import arcade
+import numpy as np
+import numpy.typing as npt
+from beartype import beartype
+
+from .constants import NumT
+from .tile_layers import TileLayers
+
+
+class OccupancyGrid:
+    """Number of blocking tiles and objects in each cell of one collision profile.
+
+    Rows are counted from the bottom of the map to match arcade's coordinates.
+
+    """
+
+    @beartype
+    def __init__(
+        self, blocked: npt.NDArray[np.bool_], tile_size: tuple[int, int]
+    ) -> None:
+        self.counts = blocked.astype(np.uint16)
+        self.tile_width, self.tile_height = tile_size
+
+    @classmethod
+    @beartype
+    def from_tile_layers(
+        cls, tile_layers: TileLayers, layer_names: list[str]
+    ) -> "OccupancyGrid":
+        """Mark every cell with a tile in any of the layers as blocked."""
+        blocked = np.flipud(tile_layers.occupied(layer_names))
+        return cls(blocked, tile_layers.tile_size)
+
+    @property
+    @beartype
+    def shape(self) -> tuple[int, int]:
+        return self.counts.shape
+
+    @beartype
+    def _get_bounds(
+        self, left: NumT, bottom: NumT, right: NumT, top: NumT
+    ) -> tuple[int, int, int, int]:
+        """Return the first and last rows and columns under the box, exclusive."""
+        col_start = math.floor(left / self.tile_width)
+        row_start = math.floor(bottom / self.tile_height)
+        col_end = max(math.ceil(right / self.tile_width), col_start + 1)
+        row_end = max(math.ceil(top / self.tile_height), row_start + 1)
+        return row_start, row_end, col_start, col_end
+
+    @beartype
+    def get_cells(
+        self, left: NumT, bottom: NumT, right: NumT, top: NumT
+    ) -> tuple[slice, slice] | None:
+        """Return the rows and columns under the box, or None if it leaves the map."""
+        rows, columns = self.shape
+        row_start, row_end, col_start, col_end = self._get_bounds(
+            left, bottom, right, top
+        )
+        if col_start < 0 or row_start < 0 or col_end > columns or row_end > rows:
+            return None
+        return slice(row_start, row_end), slice(col_start, col_end)
+
+    @beartype
+    def is_blocked(self, left: NumT, bottom: NumT, right: NumT, top: NumT) -> bool:
+        if not (cells := self.get_cells(left, bottom, right, top)):
+            return True
+        return bool(self.counts[cells].any())
+
+    @beartype
+    def get_blocked_cells(
+        self, left: NumT, bottom: NumT, right: NumT, top: NumT
+    ) -> set[tuple[int, int]]:
+        """Return the blocked cells under the box, including those outside the map."""
+        rows, columns = self.shape
+        row_start, row_end, col_start, col_end = self._get_bounds(
+            left, bottom, right, top
+        )
+        return {
+            (row, column)
+            for row in range(row_start, row_end)
+            for column in range(col_start, col_end)
+            if not (0 <= row < rows and 0 <= column < columns)
+            or self.counts[row, column]
+        }
+
+    @beartype
+    def add_sprite(self, sprite: arcade.Sprite) -> None:
+        """Block the cells under a sprite from an object layer."""
+        self._update_sprite(sprite, 1)
+
+    @beartype
+    def remove_sprite(self, sprite: arcade.Sprite) -> None:
+        self._update_sprite(sprite, -1)
+
+    @beartype
+    def _update_sprite(self, sprite: arcade.Sprite, delta: int) -> None:
+        if cells := self.get_cells(
+            sprite.left, sprite.bottom, sprite.right, sprite.top
+        ):
+            counts = self.counts[cells].astype(np.int32) + delta
+            self.counts[cells] = np.clip(counts, 0, None)
+
+
+class OccupancyPhysicsEngine:
+    """Drop-in for `arcade.PhysicsEngineSimple` that checks an `OccupancyGrid`.
+
+    Movement is resolved one axis at a time, so the player slides along walls.
+
+    """
+
+    @beartype
+    def __init__(self, player_sprite: arcade.Sprite, grid: OccupancyGrid) -> None:
+        self.player_sprite = player_sprite
+        self.grid = grid
+
+    @beartype
+    def _get_overlap(self) -> set[tuple[int, int]]:
+        sprite = self.player_sprite
+        return self.grid.get_blocked_cells(
+            sprite.left, sprite.bottom, sprite.right, sprite.top
+        )
+
+    @beartype
+    def _is_allowed(self, overlap: set[tuple[int, int]]) -> bool:
+        """Check that the move only overlaps blocked cells that were already overlapped.
+
+        A player that starts inside walls, such as after docking, can leave them but
+        not move further into them.
+
+        """
+        if not overlap:
+            sprite = self.player_sprite
+            return not self.grid.is_blocked(
+                sprite.left, sprite.bottom, sprite.right, sprite.top
+            )
+        return self._get_overlap() <= overlap
+
+    @beartype
+    def update(self) -> list[str]:
+        """Move the player sprite and return the axes that were blocked."""
+        sprite = self.player_sprite
+        overlap = self._get_overlap()
+        blocked = []
+        if sprite.change_x:
+            sprite.center_x += sprite.change_x
+            if not self._is_allowed(overlap):
+                sprite.center_x -= sprite.change_x
+                blocked.append("x")
+            elif overlap:
+                overlap = self._get_overlap()
+        if sprite.change_y:
+            sprite.center_y += sprite.change_y
+            if not self._is_allowed(overlap):
+                sprite.center_y -= sprite.change_y
+                blocked.append("y")
+        return blocked
@@ -47,7 +47,7 @@ class PauseMenu(arcade.View):
         self.game_view.restart()
 
     def on_click_quit(self, event):  # type: ignore[no-untyped-def]
-        arcade.exit()  # type: ignore[no-untyped-call]
+        self.game_view.quit_game()
 
     @beartype
     def on_key_press(self, key: int, modifiers: int) -> None:
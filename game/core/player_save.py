@@ -0,0 +1,176 @@
+"""Versioned binary format for the player save file.
+
+The file is a fixed header followed by fixed-layout records. Item textures are not
+embedded, but referenced by the hash of their pixels in a shared `TextureStore`.
+
+"""
+
+import hashlib
+import math
+import struct
+from io import BytesIO
+from typing import Any
+
+import arcade
+import PIL.Image
+from beartype import beartype
+
+from .state_store import STATE_STORE, StateStore
+from .views.vehicle_sprite import VehicleType
+
+MAGIC = b"DPAS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+"""Magic bytes and format version."""
+_POSITION = struct.Struct("<dd")
+"""Player x and y."""
+_VEHICLE = struct.Struct("<B?dd")
+"""Vehicle type code (0 for None), docked, and vehicle x and y (NaN for None)."""
+_INVENTORY = struct.Struct("<Hh")
+"""Number of items and the index of the equipped item (-1 for None)."""
+_ITEM = struct.Struct("<32s32sI?")
+"""Item name, texture digest, count, and whether the item is equippable."""
+_NAME_SIZE = 32
+
+_VEHICLE_TYPES = [None, *VehicleType]
+
+
+class TextureStore:
+    """Content-addressed item textures, saved once per unique image.
+
+    The images are saved in the `StateStore`, so they are committed in the same
+    transaction as the player that references them.
+
+    """
+
+    @beartype
+    def __init__(self, store: StateStore = STATE_STORE) -> None:
+        self.store = store
+        self._digests: dict[str, bytes] = {}
+        self._textures: dict[bytes, arcade.Texture] = {}
+
+    @beartype
+    def put(self, texture: arcade.Texture) -> bytes:
+        """Return the digest for the texture, storing the image on first use."""
+        if digest := self._digests.get(texture.name):
+            return digest
+        image = texture.image
+        header = f"{image.mode}:{image.width}x{image.height}:".encode()
+        digest = hashlib.sha256(header + image.tobytes()).digest()
+        if digest not in self._textures and self.store.get_texture(digest) is None:
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            self.store.set_texture(digest, buffer.getvalue())
+        self._digests[texture.name] = digest
+        self._textures.setdefault(digest, texture)
+        return digest
+
+    @beartype
+    def get(self, digest: bytes) -> arcade.Texture:
+        """Return the single shared texture for the digest."""
+        if texture := self._textures.get(digest):
+            return texture
+        if (data := self.store.get_texture(digest)) is None:
+            raise KeyError(f"No saved texture {digest.hex()}")
+        image = PIL.Image.open(BytesIO(data))
+        image.load()
+        texture = arcade.Texture(name=digest.hex(), image=image)
+        self._digests[texture.name] = digest
+        self._textures[digest] = texture
+        return texture
+
+    @beartype
+    def clear(self) -> None:
+        """Forget the stored images, so they are saved again after a new game."""
+        self._digests.clear()
+        self._textures.clear()
+
+
+TEXTURE_STORE = TextureStore()
+"""Process-wide store of item textures."""
+
+
+@beartype
+def is_binary_save(data: bytes) -> bool:
+    return data[: len(MAGIC)] == MAGIC
+
+
+@beartype
+def _encode_name(name: str) -> bytes:
+    encoded = name.encode()
+    if len(encoded) > _NAME_SIZE:
+        raise ValueError(f"Item name is too long to save: '{name}'")
+    return encoded
+
+
+@beartype
+def encode_player_data(
+    data: dict[str, Any],
+    inventory: list[arcade.Sprite],
+    texture_store: TextureStore = TEXTURE_STORE,
+) -> bytes:
+    """Serialize the player data with the inventory sprites."""
+    names = [item.properties["name"] for item in inventory]
+    equipped = data["item"].properties["name"] if data["item"] else None
+    vehicle_x, vehicle_y = data["vehicle_x"], data["vehicle_y"]
+    chunks = [
+        _HEADER.pack(MAGIC, VERSION),
+        _POSITION.pack(data["x"], data["y"]),
+        _VEHICLE.pack(
+            _VEHICLE_TYPES.index(data["vehicle_type"]),
+            data["vehicle_docked"],
+            math.nan if vehicle_x is None else vehicle_x,
+            math.nan if vehicle_y is None else vehicle_y,
+        ),
+        _INVENTORY.pack(
+            len(inventory), names.index(equipped) if equipped in names else -1
+        ),
+    ]
+    for item in inventory:
+        chunks.append(
+            _ITEM.pack(
+                _encode_name(item.properties["name"]),
+                texture_store.put(item.texture),
+                item.properties["count"],
+                "equippable" in item.properties,
+            )
+        )
+    return b"".join(chunks)
+
+
+@beartype
+def decode_player_data(raw: bytes) -> dict[str, Any]:
+    """Parse the binary save into the same shape as `DEFAULT_PLAYER_DATA`."""
+    magic, version = _HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported player save: {magic!r} v{version}")
+    offset = _HEADER.size
+    center_x, center_y = _POSITION.unpack_from(raw, offset)
+    offset += _POSITION.size
+    vehicle_code, docked, vehicle_x, vehicle_y = _VEHICLE.unpack_from(raw, offset)
+    offset += _VEHICLE.size
+    count, equipped = _INVENTORY.unpack_from(raw, offset)
+    offset += _INVENTORY.size
+    inventory = []
+    for _ in range(count):
+        name, digest, item_count, equippable = _ITEM.unpack_from(raw, offset)
+        offset += _ITEM.size
+        item = {
+            "name": name.rstrip(b"\0").decode(),
+            "count": item_count,
+            "digest": digest,
+        }
+        if equippable:
+            item["equippable"] = True
+        inventory.append(item)
+    return {
+        "x": center_x,
+        "y": center_y,
+        "inventory": inventory,
+        "item": inventory[equipped] if equipped >= 0 else None,
+        "vehicle_type": _VEHICLE_TYPES[vehicle_code],
+        "vehicle_x": None if math.isnan(vehicle_x) else vehicle_x,
+        "vehicle_y": None if math.isnan(vehicle_y) else vehicle_y,
+        "vehicle_docked": docked,
+    }
@@ -0,0 +1,83 @@
+"""Background persistence of the save files."""
+
+import atexit
+import os
+import tempfile
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+
+from beartype import beartype
+from loguru import logger
+
+
+@beartype
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write to a temporary file in the same directory, then rename over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as _f:
+            _f.write(data)
+            _f.flush()
+            os.fsync(_f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class SaveWorker:
+    """Dedicated thread that owns all writes to the save files.
+
+    Writes are queued by key, like the target path. Repeated writes of the same key
+    before the thread gets to it are coalesced so that only the latest one runs.
+
+    """
+
+    @beartype
+    def __init__(self) -> None:
+        self._queue: Queue[Hashable] = Queue()
+        self._pending: dict[Hashable, Callable[[], None]] = {}
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    @beartype
+    def submit(self, key: Hashable, task: Callable[[], None]) -> None:
+        """Run the task on the worker thread, replacing any queued task of the key."""
+        with self._lock:
+            if key not in self._pending:
+                self._start()
+                self._queue.put(key)
+            self._pending[key] = task
+
+    @beartype
+    def flush(self) -> None:
+        """Block until every queued write has run."""
+        if self._thread:
+            self._queue.join()
+
+    @beartype
+    def _start(self) -> None:
+        if not self._thread or not self._thread.is_alive():
+            self._thread = Thread(target=self._run, name="SaveWorker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            key = self._queue.get()
+            try:
+                with self._lock:
+                    task = self._pending.pop(key)
+                task()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(f"Failed to save {key}")
+            finally:
+                self._queue.task_done()
+
+
+SAVE_WORKER = SaveWorker()
+"""Process-wide persistence thread."""
+
+atexit.register(SAVE_WORKER.flush)
@@ -0,0 +1,166 @@
+"""Uniform grid of the sprites in the map's object layers.
+
+Queries only visit the cells around the point or box of interest, so looking up the
+items near the player does not depend on how many items are on the map.
+
+"""
+
+import heapq
+import math
+
+from arcade.sprite import Sprite
+from beartype import beartype
+
+from .constants import NumT
+
+CellT = tuple[int, int]
+
+
+class SpatialIndex:
+    """Rectangle, radius, and nearest neighbor queries for each layer.
+
+    Sprites are bucketed by their bounding box and must be re-inserted after moving.
+
+    """
+
+    @beartype
+    def __init__(self, width: NumT, height: NumT, cell_size: int = 128) -> None:
+        self.cell_size = cell_size
+        self.columns = max(math.ceil(width / cell_size), 1)
+        self.rows = max(math.ceil(height / cell_size), 1)
+        self.cells: dict[str, dict[CellT, list[Sprite]]] = {}
+        self.sprite_cells: dict[str, dict[Sprite, list[CellT]]] = {}
+
+    @beartype
+    def _get_cell(self, x: NumT, y: NumT) -> CellT:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    @beartype
+    def _get_cells(
+        self, left: NumT, bottom: NumT, right: NumT, top: NumT
+    ) -> list[CellT]:
+        min_col, min_row = self._get_cell(left, bottom)
+        max_col, max_row = self._get_cell(right, top)
+        return [
+            (col, row)
+            for col in range(min_col, max_col + 1)
+            for row in range(min_row, max_row + 1)
+        ]
+
+    @beartype
+    def _get_ring(self, col: int, row: int, ring: int) -> list[CellT]:
+        """Return the cells on the border of the square `ring` cells around a cell."""
+        if not ring:
+            return [(col, row)]
+        span = range(-ring, ring + 1)
+        keys = [(col + d_col, row + d_row) for d_col in span for d_row in (-ring, ring)]
+        keys += [
+            (col + d_col, row + d_row)
+            for d_col in (-ring, ring)
+            for d_row in span[1:-1]
+        ]
+        return keys
+
+    @beartype
+    def insert(self, layer: str, sprite: Sprite) -> None:
+        cells = self.cells.setdefault(layer, {})
+        sprite_cells = self.sprite_cells.setdefault(layer, {})
+        if sprite in sprite_cells:
+            self.remove(layer, sprite)
+        keys = self._get_cells(sprite.left, sprite.bottom, sprite.right, sprite.top)
+        for key in keys:
+            cells.setdefault(key, []).append(sprite)
+        sprite_cells[sprite] = keys
+
+    @beartype
+    def remove(self, layer: str, sprite: Sprite) -> None:
+        cells = self.cells.get(layer, {})
+        for key in self.sprite_cells.get(layer, {}).pop(sprite, []):
+            bucket = cells[key]
+            bucket.remove(sprite)
+            if not bucket:
+                del cells[key]
+
+    @beartype
+    def clear(self, layer: str) -> None:
+        self.cells.pop(layer, None)
+        self.sprite_cells.pop(layer, None)
+
+    @beartype
+    def __len__(self) -> int:
+        return sum(len(sprites) for sprites in self.sprite_cells.values())
+
+    @beartype
+    def count(self, layer: str) -> int:
+        return len(self.sprite_cells.get(layer, {}))
+
+    @beartype
+    def _visit(self, layer: str, keys: list[CellT]) -> list[Sprite]:
+        """Return the unique sprites in the cells."""
+        cells = self.cells.get(layer, {})
+        seen: dict[Sprite, None] = {}
+        for key in keys:
+            for sprite in cells.get(key, ()):
+                seen[sprite] = None
+        return [*seen]
+
+    @beartype
+    def in_rect(
+        self, layer: str, left: NumT, bottom: NumT, right: NumT, top: NumT
+    ) -> list[Sprite]:
+        """Return the sprites whose bounding box overlaps the rectangle."""
+        return [
+            sprite
+            for sprite in self._visit(layer, self._get_cells(left, bottom, right, top))
+            if sprite.left <= right
+            and sprite.right >= left
+            and sprite.bottom <= top
+            and sprite.top >= bottom
+        ]
+
+    @beartype
+    def in_radius(self, layer: str, x: NumT, y: NumT, radius: NumT) -> list[Sprite]:
+        """Return the sprites whose center is within the radius."""
+        candidates = self._visit(
+            layer, self._get_cells(x - radius, y - radius, x + radius, y + radius)
+        )
+        return [
+            sprite
+            for sprite in candidates
+            if math.dist((x, y), sprite.position) <= radius
+        ]
+
+    @beartype
+    def nearest(
+        self,
+        layer: str,
+        x: NumT,
+        y: NumT,
+        count: int = 1,
+        max_distance: NumT | None = None,
+    ) -> list[tuple[Sprite, float]]:
+        """Return up to `count` sprites by distance between centers, closest first.
+
+        Rings of cells are visited outward from the point. Any sprite that was not
+        seen yet is at least `ring * cell_size` away, which bounds the search.
+
+        """
+        if not self.count(layer):
+            return []
+        col, row = self._get_cell(x, y)
+        max_ring = max(col, self.columns - col, row, self.rows - row, 0) + 1
+        found: dict[Sprite, float] = {}
+        for ring in range(max_ring + 1):
+            reach = ring * self.cell_size
+            if max_distance is not None and reach > max_distance + self.cell_size:
+                break
+            for sprite in self._visit(layer, self._get_ring(col, row, ring)):
+                if sprite not in found:
+                    found[sprite] = math.dist((x, y), sprite.position)
+            closest = heapq.nsmallest(count, found.items(), key=lambda item: item[1])
+            if len(closest) == count and closest[-1][1] <= reach:
+                break
+        closest = heapq.nsmallest(count, found.items(), key=lambda item: item[1])
+        if max_distance is not None:
+            closest = [match for match in closest if match[1] <= max_distance]
+        return closest
@@ -0,0 +1,272 @@
+"""Single SQLite store for the player, map mutations, sprite states, and textures."""
+
+import atexit
+import json
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import Any
+
+from beartype import beartype
+from loguru import logger
+
+from .constants import STATE_DB_FILE
+from .save_worker import SAVE_WORKER
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS map_mutations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sprite_states (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS textures (
+    digest BLOB PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+
+class _Changes:
+    """Changes that are not yet committed, in the order they were made."""
+
+    def __init__(self) -> None:
+        self.player: bytes | None = None
+        self.records: list[dict[str, Any]] = []
+        self.states: dict[str, str] = {}
+        self.textures: dict[bytes, bytes] = {}
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.player is not None or self.records or self.states or self.textures
+        )
+
+    def merge(self, later: "_Changes") -> None:
+        """Add the changes that were made after these ones."""
+        if later.player is not None:
+            self.player = later.player
+        self.records += later.records
+        self.states.update(later.states)
+        self.textures.update(later.textures)
+
+
+class StateStore:
+    """Persistent game state in one SQLite database in WAL mode.
+
+    Everything but the textures is read in a single transaction on first use and
+    mirrored in memory. Changes are coalesced until `commit`, which writes them in one
+    transaction. `commit_in_background` hands them to the `SAVE_WORKER` instead, so
+    the game loop never waits on the disk.
+
+    """
+
+    @beartype
+    def __init__(self, path: Path = STATE_DB_FILE) -> None:
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._loaded = False
+        self._player: bytes | None = None
+        self._map_records: list[dict[str, Any]] = []
+        self._sprite_states: dict[str, str] = {}
+        self._pending = _Changes()
+        # Changes handed to the worker thread that it did not write yet
+        self._queued = _Changes()
+        self._lock = RLock()
+
+    @property
+    @beartype
+    def connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._connection is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Shared with the worker thread, which holds the lock to use it
+                connection = sqlite3.connect(
+                    self.path, isolation_level=None, check_same_thread=False
+                )
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                user_version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if user_version > SCHEMA_VERSION:
+                    raise RuntimeError(f"Unsupported save version {user_version}")
+                connection.executescript(_SCHEMA)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                self._connection = connection
+            return self._connection
+
+    @beartype
+    def load(self) -> None:
+        """Read every table but the textures in one read transaction."""
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN")
+            try:
+                row = connection.execute(
+                    "SELECT data FROM player WHERE id = 1"
+                ).fetchone()
+                records = connection.execute(
+                    "SELECT record FROM map_mutations ORDER BY seq"
+                ).fetchall()
+                states = connection.execute(
+                    "SELECT name, data FROM sprite_states"
+                ).fetchall()
+            finally:
+                connection.execute("COMMIT")
+        self._player = row[0] if row else None
+        self._map_records = [json.loads(record) for (record,) in records]
+        self._sprite_states = dict(states)
+        self._loaded = True
+
+    @beartype
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @beartype
+    def get_player(self) -> bytes | None:
+        self._ensure_loaded()
+        return self._player
+
+    @beartype
+    def set_player(self, data: bytes) -> None:
+        self._ensure_loaded()
+        self._player = self._pending.player = data
+
+    @property
+    @beartype
+    def map_records(self) -> list[dict[str, Any]]:
+        self._ensure_loaded()
+        return [*self._map_records]
+
+    @beartype
+    def append_map_record(self, record: dict[str, Any]) -> None:
+        self._ensure_loaded()
+        self._map_records.append(record)
+        self._pending.records.append(record)
+
+    @beartype
+    def get_sprite_state(self, name: str) -> str | None:
+        self._ensure_loaded()
+        return self._sprite_states.get(name)
+
+    @beartype
+    def set_sprite_state(self, name: str, data: str) -> None:
+        self._ensure_loaded()
+        self._sprite_states[name] = self._pending.states[name] = data
+
+    @beartype
+    def get_texture(self, digest: bytes) -> bytes | None:
+        """Return the image of a texture, which is read on demand."""
+        with self._lock:
+            for changes in (self._pending, self._queued):
+                if data := changes.textures.get(digest):
+                    return data
+            row = self.connection.execute(
+                "SELECT data FROM textures WHERE digest = ?", (digest,)
+            ).fetchone()
+        return row[0] if row else None
+
+    @beartype
+    def set_texture(self, digest: bytes, data: bytes) -> None:
+        """Save the image of a texture with the next commit, like the player."""
+        with self._lock:
+            self._pending.textures[digest] = data
+
+    @property
+    @beartype
+    def is_dirty(self) -> bool:
+        return bool(self._pending)
+
+    @beartype
+    def commit(self) -> None:
+        """Write the coalesced changes in a single transaction."""
+        with self._lock:
+            self._queue_pending()
+            self._write_queued()
+
+    @beartype
+    def commit_in_background(self) -> None:
+        """Write the coalesced changes on the `SAVE_WORKER` thread."""
+        if not self.is_dirty:
+            return
+        with self._lock:
+            self._queue_pending()
+        SAVE_WORKER.submit(self.path, self._write_queued)
+
+    @beartype
+    def _queue_pending(self) -> None:
+        self._queued.merge(self._pending)
+        self._pending = _Changes()
+
+    @beartype
+    def _write_queued(self) -> None:
+        """Write the queued changes in order, keeping them on failure to retry."""
+        with self._lock:
+            changes = self._queued
+            if not changes:
+                return
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if changes.player is not None:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO player (id, data) VALUES (1, ?)",
+                        (changes.player,),
+                    )
+                connection.executemany(
+                    "INSERT INTO map_mutations (record) VALUES (?)",
+                    [(json.dumps(record),) for record in changes.records],
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO sprite_states (name, data) VALUES (?, ?)",
+                    [*changes.states.items()],
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO textures (digest, data) VALUES (?, ?)",
+                    [*changes.textures.items()],
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            self._queued = _Changes()
+
+    @beartype
+    def clear(self) -> None:
+        """Remove all saved state."""
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            for table in ("player", "map_mutations", "sprite_states", "textures"):
+                connection.execute(f"DELETE FROM {table}")  # nosec B608
+            connection.execute("COMMIT")
+            self._pending, self._queued = _Changes(), _Changes()
+        self._player = None
+        self._map_records = []
+        self._sprite_states = {}
+        self._loaded = True
+
+    @beartype
+    def close(self) -> None:
+        try:
+            self.commit()
+        except sqlite3.Error:
+            logger.exception(f"Failed to save {self.path}")
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        self._loaded = False
+
+
+STATE_STORE = StateStore()
+"""Process-wide store of the saved game."""
+
+atexit.register(STATE_STORE.close)
@@ -0,0 +1,333 @@
+"""Tiled tile layers decoded to NumPy gid arrays.
+
+Tiled stores each tile layer as base64 (optionally zlib or gzip compressed) little
+endian `uint32` gids. Decoding every layer is done once per version of the map and its
+tilesets, then the arrays are saved as `.npy` files and memory-mapped on later starts.
+The tilesets and their tile animations are summarized alongside, so each gid can be
+drawn without the Tiled map.
+
+"""
+
+import base64
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from beartype import beartype
+from loguru import logger
+
+from .constants import MAP, MAP_CACHE_DIR
+
+GID_MASK = 0x1FFFFFFF
+"""Clear the three high bits that Tiled uses for flipped tiles."""
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+FLIPPED_DIAGONALLY = 0x20000000
+
+TILE_LAYERS_VERSION = 3
+"""Increment when the cached files change to invalidate existing caches."""
+
+GidArray = npt.NDArray[np.uint32]
+TileImageT = tuple[str, int, int, int, int]
+"""Image file and the `x`, `y`, `width`, and `height` of the tile in it."""
+FrameT = tuple[int, int]
+"""Gid and duration in milliseconds of an animation frame."""
+
+
+@beartype
+def get_map_hash(
+    map_path: Path,
+    raw_bytes: bytes | None = None,
+    tile_map: dict[str, Any] | None = None,
+) -> str:
+    """Hash the map and its tilesets to key any derived caches.
+
+    External tileset files are hashed with the map, while their images only add their
+    size and modification time to keep the hash cheap on every start.
+
+    """
+    if raw_bytes is None:
+        raw_bytes = map_path.read_bytes()
+    if tile_map is None:
+        tile_map = json.loads(raw_bytes)
+    digest = hashlib.sha256(raw_bytes)
+    for raw_tileset in tile_map["tilesets"]:
+        tileset, tileset_dir = raw_tileset, map_path.parent
+        if source := raw_tileset.get("source"):
+            tileset_path = map_path.parent / source
+            tileset_bytes = tileset_path.read_bytes()
+            digest.update(tileset_bytes)
+            tileset, tileset_dir = json.loads(tileset_bytes), tileset_path.parent
+        images = [tileset.get("image")]
+        images += [tile.get("image") for tile in tileset.get("tiles", [])]
+        for image in filter(None, images):
+            stat = (tileset_dir / image).stat()
+            digest.update(f"{image}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+@beartype
+def prune_map_cache(cache_path: Path, kind: str, current: str) -> None:
+    """Remove the caches made stale by writing `cache_path`.
+
+    Caches of the same `kind` that do not start with the `current` version sit next
+    to it, and the caches of other versions of the map are the other directories of
+    the cache root. Temporary files, which start with a dot, are left alone.
+
+    """
+    map_dir = cache_path.parent
+    stale = [
+        path
+        for path in map_dir.iterdir()
+        if path.name.startswith(kind) and not path.name.startswith(current)
+    ]
+    stale += [
+        path
+        for path in map_dir.parent.iterdir()
+        if path.is_dir() and path != map_dir and not path.name.startswith(".")
+    ]
+    for path in stale:
+        logger.debug(f"Removing the stale map cache {path}")
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+
+@beartype
+def decode_layer(layer: dict[str, Any]) -> GidArray:
+    """Decode the `data` of a Tiled tile layer to a `(height, width)` array."""
+    data = layer["data"]
+    if isinstance(data, list):  # CSV encoding is parsed by json
+        flat = np.asarray(data, dtype=np.uint32)
+    else:
+        raw = base64.b64decode(data)
+        match layer.get("compression", ""):
+            case "zlib":
+                raw = zlib.decompress(raw)
+            case "gzip":
+                raw = gzip.decompress(raw)
+            case "":
+                pass
+            case compression:
+                raise ValueError(
+                    f"Unknown compression '{compression}' of layer '{layer['name']}'"
+                )
+        flat = np.frombuffer(raw, dtype="<u4").astype(np.uint32)
+    return flat.reshape(layer["height"], layer["width"])
+
+
+class TileLayers:
+    """Read-only gid arrays for every tile layer of a map.
+
+    Rows are in Tiled order, so row zero is the top of the map.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        layers: dict[str, GidArray],
+        tile_size: tuple[int, int],
+        map_hash: str,
+        tilesets: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.layers = layers
+        self.tile_size = tile_size
+        self.map_hash = map_hash
+        self.tilesets = sorted(tilesets or [], key=lambda tileset: tileset["firstgid"])
+        self._first_gids = [tileset["firstgid"] for tileset in self.tilesets]
+
+    @property
+    @beartype
+    def shape(self) -> tuple[int, int]:
+        """Map size as `(rows, columns)`."""
+        return next(iter(self.layers.values())).shape
+
+    @beartype
+    def __getitem__(self, name: str) -> GidArray:
+        return self.layers[name]
+
+    @beartype
+    def __contains__(self, name: str) -> bool:
+        return name in self.layers
+
+    @beartype
+    def gids(self, name: str) -> GidArray:
+        """Return the gids without the flip flags."""
+        gids: GidArray = self.layers[name] & np.uint32(GID_MASK)
+        return gids
+
+    @beartype
+    def _get_tileset(self, gid: int) -> tuple[dict[str, Any], int]:
+        """Return the tileset of a gid and the local id of the tile in it."""
+        gid &= GID_MASK
+        index = bisect.bisect_right(self._first_gids, gid) - 1
+        if index < 0:
+            raise KeyError(f"No tileset for gid {gid}")
+        tileset = self.tilesets[index]
+        return tileset, gid - tileset["firstgid"]
+
+    @beartype
+    def get_tile_image(self, gid: int) -> TileImageT:
+        """Locate the image of a gid, ignoring the flip flags."""
+        tileset, local_id = self._get_tileset(gid)
+        if tile := tileset["tiles"].get(str(local_id)):
+            return tile["image"], 0, 0, tile["width"], tile["height"]
+        width, height = tileset["tilewidth"], tileset["tileheight"]
+        margin, spacing = tileset["margin"], tileset["spacing"]
+        column, row = local_id % tileset["columns"], local_id // tileset["columns"]
+        return (
+            tileset["image"],
+            margin + column * (width + spacing),
+            margin + row * (height + spacing),
+            width,
+            height,
+        )
+
+    @beartype
+    def get_animation(self, gid: int) -> list[FrameT]:
+        """Return the frames of an animated gid with its flip flags, or no frames."""
+        tileset, local_id = self._get_tileset(gid)
+        flags = gid & ~GID_MASK
+        return [
+            ((tileset["firstgid"] + tile_id) | flags, duration)
+            for tile_id, duration in tileset["animations"].get(str(local_id), [])
+        ]
+
+    @beartype
+    def is_animated(self, name: str) -> bool:
+        """Check if any tile of the layer has an animation."""
+        gids = np.unique(self.gids(name))
+        return any(self.get_animation(int(gid)) for gid in gids[gids != 0])
+
+    @property
+    @beartype
+    def max_tile_size(self) -> tuple[int, int]:
+        """Largest tile in any tileset, since tiles can overhang their cell."""
+        sizes = [self.tile_size]
+        for tileset in self.tilesets:
+            sizes.append((tileset["tilewidth"], tileset["tileheight"]))
+            sizes.extend(
+                (tile["width"], tile["height"]) for tile in tileset["tiles"].values()
+            )
+        return max(size[0] for size in sizes), max(size[1] for size in sizes)
+
+    @beartype
+    def occupied(self, names: list[str] | tuple[str, ...]) -> npt.NDArray[np.bool_]:
+        """Return a mask of the cells with a tile in any of the layers."""
+        mask = np.zeros(self.shape, dtype=np.bool_)
+        for name in names:
+            if name in self.layers:
+                mask |= self.layers[name] != 0
+        return mask
+
+
+@beartype
+def summarize_tilesets(tile_map: dict[str, Any], map_dir: Path) -> list[dict[str, Any]]:
+    """Read the grid, the animations, and the images of image collection tilesets.
+
+    Image paths are resolved from the map or tileset file to stay valid on their own.
+
+    """
+    tilesets = []
+    for raw_tileset in tile_map["tilesets"]:
+        tileset_dir = map_dir
+        if source := raw_tileset.get("source"):
+            tileset_path = map_dir / source
+            tileset_dir = tileset_path.parent
+            tileset = json.loads(tileset_path.read_text())
+        else:
+            tileset = raw_tileset
+        tiles = {
+            str(tile["id"]): {
+                "image": os.path.normpath(tileset_dir / tile["image"]),
+                "width": tile["imagewidth"],
+                "height": tile["imageheight"],
+            }
+            for tile in tileset.get("tiles", [])
+            if "image" in tile
+        }
+        animations = {
+            str(tile["id"]): [
+                [frame["tileid"], frame["duration"]] for frame in tile["animation"]
+            ]
+            for tile in tileset.get("tiles", [])
+            if tile.get("animation")
+        }
+        image = tileset.get("image")
+        tilesets.append(
+            {
+                "firstgid": raw_tileset["firstgid"],
+                "image": os.path.normpath(tileset_dir / image) if image else None,
+                "columns": tileset.get("columns") or 1,
+                "tilewidth": tileset["tilewidth"],
+                "tileheight": tileset["tileheight"],
+                "margin": tileset.get("margin", 0),
+                "spacing": tileset.get("spacing", 0),
+                "tiles": tiles,
+                "animations": animations,
+            }
+        )
+    return tilesets
+
+
+@beartype
+def _write_cache(tile_map: dict[str, Any], cache_dir: Path, map_dir: Path) -> None:
+    """Decode every tile layer and publish the cache directory atomically."""
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=cache_dir.parent, prefix=".tmp-"))
+    try:
+        names = []
+        for layer in tile_map["layers"]:
+            if layer["type"] != "tilelayer":
+                continue
+            names.append(layer["name"])
+            np.save(tmp_dir / f"{len(names) - 1}.npy", decode_layer(layer))
+        index = {
+            "layers": names,
+            "tile_size": [tile_map["tilewidth"], tile_map["tileheight"]],
+            "tilesets": summarize_tilesets(tile_map, map_dir),
+        }
+        (tmp_dir / "index.json").write_text(json.dumps(index))
+        tmp_dir.rename(cache_dir)
+    except OSError:
+        # Another process may have published the same cache first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not (cache_dir / "index.json").is_file():
+            raise
+
+
+@beartype
+def load_tile_layers(
+    map_path: Path = MAP,
+    cache_root: Path = MAP_CACHE_DIR,
+    tile_map: dict[str, Any] | None = None,
+    map_hash: str | None = None,
+) -> TileLayers:
+    """Return memory-mapped gid arrays for the map, decoding only on a cache miss."""
+    map_hash = map_hash or get_map_hash(map_path, tile_map=tile_map)
+    cache_dir = cache_root / map_hash / f"tile_layers-v{TILE_LAYERS_VERSION}"
+    if not (cache_dir / "index.json").is_file():
+        logger.debug(f"Decoding tile layers for {map_path} into {cache_dir}")
+        if tile_map is None:
+            tile_map = json.loads(map_path.read_text())
+        _write_cache(tile_map, cache_dir, map_path.parent)
+        prune_map_cache(cache_dir, "tile_layers", cache_dir.name)
+    index = json.loads((cache_dir / "index.json").read_text())
+    layers = {
+        name: np.load(cache_dir / f"{idx}.npy", mmap_mode="r")
+        for idx, name in enumerate(index["layers"])
+    }
+    return TileLayers(
+        layers, tuple(index["tile_size"]), map_hash, tilesets=index["tilesets"]
+    )
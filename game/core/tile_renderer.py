@@ -0,0 +1,275 @@
+"""Tile layers drawn straight from their gid arrays.
+
+No sprite is created for the tiles. Each gid is resolved once to a texture in the
+atlas, then every tile of a region becomes one vertex of a buffer that is drawn with
+arcade's sprite list shader, so the memory and the number of Python objects follow the
+number of distinct tiles instead of the size of the map.
+
+Animated tiles pick their frame in the vertex shader from a table of frames and the
+game time, so animating the tiles costs no work per tile on the CPU.
+
+"""
+
+from typing import Any
+
+import arcade
+import numpy as np
+import numpy.typing as npt
+from arcade.gl import Buffer, BufferDescription, Program, Texture
+from arcade.resources import resolve_resource_path
+from beartype import beartype
+
+from .constants import NumT
+from .tile_layers import (
+    FLIPPED_DIAGONALLY,
+    FLIPPED_HORIZONTALLY,
+    FLIPPED_VERTICALLY,
+    TileLayers,
+)
+
+_TILE_VERTEX_SHADER = """
+#version 330
+uniform sampler2D animation_frames;
+uniform float time;
+in vec2 in_pos;
+in float in_angle;
+in vec2 in_size;
+in float in_texture;
+in vec4 in_color;
+in float in_animation;
+out float v_angle;
+out vec4 v_color;
+out vec2 v_size;
+out float v_texture;
+void main() {
+    gl_Position = vec4(in_pos, 0.0, 1.0);
+    v_angle = in_angle;
+    v_color = in_color;
+    v_size = in_size;
+    v_texture = in_texture;
+    if (in_animation >= 0.0) {
+        // The first texel has the number of frames and the total duration
+        int row = int(in_animation);
+        vec2 info = texelFetch(animation_frames, ivec2(0, row), 0).xy;
+        float elapsed = mod(time, info.y);
+        for (int frame = 1; frame <= int(info.x); frame++) {
+            vec2 slot_end = texelFetch(animation_frames, ivec2(frame, row), 0).xy;
+            v_texture = slot_end.x;
+            if (elapsed < slot_end.y) {
+                break;
+            }
+        }
+    }
+}
+"""
+
+TILE_VERTEX = np.dtype(
+    [
+        ("position", np.float32, 2),
+        ("size", np.float32, 2),
+        ("angle", np.float32),
+        ("texture", np.float32),
+        ("color", np.uint8, 4),
+        ("animation", np.float32),
+    ]
+)
+"""Interleaved attributes of arcade's sprite list shader for each tile."""
+
+TileVertexArray = npt.NDArray[Any]
+
+
+@beartype
+def describe_tile_vertices(buffer: Buffer) -> BufferDescription:
+    """Map the `TILE_VERTEX` fields of the buffer to the shader attributes."""
+    return BufferDescription(
+        buffer,
+        "2f 2f 1f 1f 4f1 1f",
+        ["in_pos", "in_size", "in_angle", "in_texture", "in_color", "in_animation"],
+        normalized=["in_color"],
+    )
+
+
+class TileAtlas:
+    """Atlas slot and size of the texture for each gid, including the flip flags.
+
+    Each animated gid also has a row in `animations` with the atlas slot and the end
+    time in milliseconds of each frame.
+
+    """
+
+    @beartype
+    def __init__(
+        self, tile_layers: TileLayers, atlas: arcade.TextureAtlas | None = None
+    ) -> None:
+        self.tile_layers = tile_layers
+        self._atlas = atlas
+        self._entries: dict[int, tuple[int, int, int, int]] = {}
+        self.animations: list[list[tuple[int, int]]] = []
+        self._program: Program | None = None
+        self._frames: Texture | None = None
+
+    @property
+    @beartype
+    def atlas(self) -> arcade.TextureAtlas:
+        if self._atlas is None:
+            self._atlas = arcade.get_window().ctx.default_atlas
+        return self._atlas
+
+    @beartype
+    def get_entry(self, gid: int) -> tuple[int, int, int, int]:
+        """Return the atlas slot, width, height, and animation row of the gid.
+
+        The row is `-1` for tiles that are not animated.
+
+        """
+        if (entry := self._entries.get(gid)) is None:
+            if frames := self.tile_layers.get_animation(gid):
+                slots, end = [], 0
+                for frame_gid, duration in frames:
+                    end += duration
+                    slots.append((self.get_entry(frame_gid)[0], end))
+                _slot, width, height, _row = self.get_entry(frames[0][0])
+                self.animations.append(slots)
+                self._frames = None
+                entry = (slots[0][0], width, height, len(self.animations) - 1)
+                self._entries[gid] = entry
+                return entry
+            file_name, x, y, width, height = self.tile_layers.get_tile_image(gid)
+            texture = arcade.load_texture(
+                file_name,
+                x,
+                y,
+                width,
+                height,
+                flipped_horizontally=bool(gid & FLIPPED_HORIZONTALLY),
+                flipped_vertically=bool(gid & FLIPPED_VERTICALLY),
+                flipped_diagonally=bool(gid & FLIPPED_DIAGONALLY),
+                hit_box_algorithm="None",
+            )
+            slot, _region = self.atlas.add(texture)
+            entry = (slot, texture.width, texture.height, -1)
+            self._entries[gid] = entry
+        return entry
+
+    @beartype
+    def lookup(self, gids: npt.NDArray[np.uint32]) -> npt.NDArray[np.float32]:
+        """Return the entry of each gid as a `(count, 4)` array."""
+        unique, inverse = np.unique(gids, return_inverse=True)
+        table = np.array(
+            [self.get_entry(int(gid)) for gid in unique], dtype=np.float32
+        ).reshape(-1, 4)
+        return table[inverse.reshape(-1)]
+
+    @property
+    @beartype
+    def program(self) -> Program:
+        """Arcade's sprite list program with the animated vertex shader."""
+        if self._program is None:
+            ctx = arcade.get_window().ctx
+            shaders = ":resources:shaders/sprites/sprite_list_geometry_{}.glsl"
+            self._program = ctx.program(
+                vertex_shader=_TILE_VERTEX_SHADER,
+                geometry_shader=resolve_resource_path(
+                    shaders.format("cull_geo")
+                ).read_text(),
+                fragment_shader=resolve_resource_path(shaders.format("fs")).read_text(),
+            )
+            self._program["sprite_texture"] = 0
+            self._program["uv_texture"] = 1
+            self._program["animation_frames"] = 2
+        return self._program
+
+    @property
+    @beartype
+    def frames(self) -> Texture:
+        """Frame table with a row per animation, rebuilt after adding animations."""
+        if self._frames is None:
+            ctx = arcade.get_window().ctx
+            columns = max((len(slots) for slots in self.animations), default=0) + 1
+            table = np.zeros((max(len(self.animations), 1), columns, 2), np.float32)
+            for row, slots in enumerate(self.animations):
+                table[row, 0] = len(slots), slots[-1][1]
+                table[row, 1 : len(slots) + 1] = slots
+            self._frames = ctx.texture(
+                (columns, len(table)),
+                components=2,
+                dtype="f4",
+                data=table.tobytes(),
+                filter=(ctx.NEAREST, ctx.NEAREST),
+            )
+        return self._frames
+
+
+@beartype
+def build_tile_vertices(
+    tile_atlas: TileAtlas,
+    names: list[str],
+    rows: tuple[int, int],
+    columns: tuple[int, int],
+) -> TileVertexArray:
+    """Create a vertex for each tile of the layers in the range of Tiled rows.
+
+    Tiles are placed like arcade places them, from the bottom left corner of their
+    cell, and are ordered by layer then row to keep the draw order.
+
+    """
+    tile_layers = tile_atlas.tile_layers
+    tile_width, tile_height = tile_layers.tile_size
+    map_rows = tile_layers.shape[0]
+    parts = []
+    for name in names:
+        gids = tile_layers[name][rows[0] : rows[1], columns[0] : columns[1]]
+        row_indices, column_indices = np.nonzero(gids)
+        if not len(row_indices):
+            continue
+        entries = tile_atlas.lookup(gids[row_indices, column_indices])
+        vertices = np.zeros(len(row_indices), dtype=TILE_VERTEX)
+        vertices["position"][:, 0] = (
+            column_indices + columns[0]
+        ) * tile_width + entries[:, 1] / 2
+        vertices["position"][:, 1] = (
+            map_rows - (row_indices + rows[0]) - 1
+        ) * tile_height + entries[:, 2] / 2
+        vertices["size"] = entries[:, 1:3]
+        vertices["texture"] = entries[:, 0]
+        vertices["color"] = 255
+        vertices["animation"] = entries[:, 3]
+        parts.append(vertices)
+    if not parts:
+        return np.zeros(0, dtype=TILE_VERTEX)
+    return np.concatenate(parts)
+
+
+class TileGeometry:
+    """One vertex buffer drawn as a single call with the sprite list shaders."""
+
+    @beartype
+    def __init__(
+        self,
+        ctx: arcade.ArcadeContext,
+        vertices: TileVertexArray,
+        tile_atlas: TileAtlas,
+    ) -> None:
+        self.ctx = ctx
+        self.tile_atlas = tile_atlas
+        self.count = len(vertices)
+        self.buffer = ctx.buffer(data=vertices.tobytes())
+        self.geometry = ctx.geometry([describe_tile_vertices(self.buffer)])
+
+    @beartype
+    def draw(
+        self, *, blend_function: tuple[int, int] | None = None, time: NumT = 0
+    ) -> None:
+        """Draw like `arcade.SpriteList.draw` at the game time in milliseconds."""
+        ctx = self.ctx
+        atlas = self.tile_atlas.atlas
+        ctx.enable(ctx.BLEND)  # type: ignore[no-untyped-call]
+        ctx.blend_func = blend_function or ctx.BLEND_DEFAULT
+        atlas.texture.filter = ctx.LINEAR, ctx.LINEAR
+        program = self.tile_atlas.program
+        program["spritelist_color"] = 1.0, 1.0, 1.0, 1.0
+        program["time"] = time
+        atlas.texture.use(0)
+        atlas.use_uv_texture(1)
+        self.tile_atlas.frames.use(2)
+        self.geometry.render(program, mode=ctx.POINTS, vertices=self.count)
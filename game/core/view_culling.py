@@ -0,0 +1,79 @@
+"""Draw only the sprites that are in the camera view.
+
+Each layer is drawn from a sprite list that holds the sprites found in the view by
+the spatial index. The list is only rebuilt when the sprites in view change, so the
+draw cost follows the size of the viewport instead of the size of the map.
+
+"""
+
+import weakref
+
+import arcade
+from arcade.sprite import Sprite
+from beartype import beartype
+
+from .constants import SPRITE_SIZE, NumT
+from .spatial_index import SpatialIndex
+
+
+class ViewCuller:
+    """Sprite lists with the sprites of each layer that are in view.
+
+    `counts` has the number of submitted and culled sprites for each layer.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        spatial_index: SpatialIndex,
+        layers: list[str],
+        margin: NumT = SPRITE_SIZE,
+    ) -> None:
+        self.spatial_index = spatial_index
+        self.layers = layers
+        self.margin = margin
+        self.sprite_lists = {layer: arcade.SpriteList() for layer in layers}
+        self.counts: dict[str, tuple[int, int]] = {}
+        # Keep the draw order of each layer for the sprites in view
+        self._order: weakref.WeakKeyDictionary[
+            Sprite, int
+        ] = weakref.WeakKeyDictionary()
+        self._next_order = 0
+
+    @beartype
+    def set_order(self, sprites: list[Sprite] | arcade.SpriteList) -> None:
+        """Draw the sprites in this order. Sprites not seen before are drawn last."""
+        for sprite in sprites:
+            self._get_order(sprite)
+
+    @beartype
+    def _get_order(self, sprite: Sprite) -> int:
+        if sprite not in self._order:
+            self._order[sprite] = self._next_order
+            self._next_order += 1
+        return self._order[sprite]
+
+    @beartype
+    def update(self, left: NumT, bottom: NumT, width: NumT, height: NumT) -> None:
+        margin = self.margin
+        for layer in self.layers:
+            visible = self.spatial_index.in_rect(
+                layer,
+                left - margin,
+                bottom - margin,
+                left + width + margin,
+                bottom + height + margin,
+            )
+            sprite_list = self.sprite_lists[layer]
+            if len(visible) != len(sprite_list) or set(visible) != set(sprite_list):
+                sprite_list.clear()
+                sprite_list.extend(sorted(visible, key=self._get_order))
+            total = self.spatial_index.count(layer)
+            self.counts[layer] = (len(visible), total - len(visible))
+
+    @beartype
+    def draw(self) -> None:
+        for layer in self.layers:
+            if self.sprite_lists[layer]:
+                self.sprite_lists[layer].draw()  # type: ignore[no-untyped-call]
@@ -58,5 +58,5 @@ def board_raft(raft, player_sprite, game_map) -> None:
 @beartype
 def dock_raft(raft, player_sprite, game_map, target) -> None:
     game_map.move_on_land()  # type: ignore[no-untyped-call]
-    player_sprite.update_player_position(target.center_x, target.center_y)
+    player_sprite.update_player_position(*target)
     raft.docked = True
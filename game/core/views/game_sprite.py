@@ -7,6 +7,7 @@ from ..constants import SPRITE_SIZE
 from ..game_clock import GameClock
 from ..models import EntityAttr, SpriteState
 from ..models.sprite_state import Direction
+from .spritesheets import load_spritesheet
 
 
 class GameSprite(arcade.Sprite):
@@ -18,7 +19,7 @@ class GameSprite(arcade.Sprite):
         self.change_x, self.change_y = 0, 0
         self.attr = attr
         self.state = state.load_state()
-        self._textures = arcade.load_spritesheet(
+        self._textures = load_spritesheet(
             state.sprite_resource,
             sprite_width=SPRITE_SIZE,
             sprite_height=SPRITE_SIZE,
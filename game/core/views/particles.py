@@ -0,0 +1,143 @@
+"""Animated particles drawn in a single batch."""
+
+import arcade
+import numpy as np
+import numpy.typing as npt
+from arcade.gl import Buffer, Geometry
+from arcade.sprite import Sprite
+from beartype import beartype
+
+from ..constants import NumT
+from ..game_clock import GameClock
+from ..tile_renderer import TILE_VERTEX, describe_tile_vertices
+
+
+class ParticleEmitters:
+    """One looping animation shown at the position of each emitter sprite.
+
+    The instances are rows of a vertex array with the phase of their animation, so
+    advancing the frames is a single vectorized step on the shared game clock and
+    drawing them is one call, however many emitters there are.
+
+    """
+
+    @beartype
+    def __init__(
+        self,
+        game_clock: GameClock,
+        name: str,
+        frames: tuple[int, ...] = (1, 2, 3, 2),
+        frame_time: NumT = 0.2,
+        scale: NumT = 1,
+        capacity: int = 64,
+    ) -> None:
+        self.game_clock = game_clock
+        self.start_time = game_clock.current_time
+        self.frames = frames
+        self.frame_time = frame_time
+        self.scale = scale
+        self.textures = {
+            frame: arcade.load_texture(f":animation:{name}/{frame}.png")
+            for frame in sorted(set(frames))
+        }
+        self.emitters: list[Sprite] = []
+        self._indices: dict[Sprite, int] = {}
+        self.vertices = np.zeros(capacity, dtype=TILE_VERTEX)
+        self.phases = np.zeros(capacity, dtype=np.float64)
+        self._slots: npt.NDArray[np.float32] | None = None
+        self._buffer: Buffer | None = None
+        self._geometry: Geometry | None = None
+        self._changed = True
+
+    @beartype
+    def __len__(self) -> int:
+        return len(self.emitters)
+
+    @beartype
+    def __contains__(self, emitter: Sprite) -> bool:
+        return emitter in self._indices
+
+    @beartype
+    def get_elapsed(self) -> float:
+        return (self.game_clock.current_time - self.start_time).total_seconds()
+
+    @beartype
+    def add(self, emitter: Sprite) -> None:
+        """Start the animation at the emitter from its first frame."""
+        if emitter in self._indices:
+            return
+        index = len(self.emitters)
+        if index == len(self.vertices):
+            self.vertices = np.resize(self.vertices, index * 2)
+            self.phases = np.resize(self.phases, index * 2)
+        texture = self.textures[self.frames[0]]
+        vertex = self.vertices[index : index + 1]
+        vertex["position"] = emitter.position
+        vertex["size"] = texture.width * self.scale, texture.height * self.scale
+        vertex["color"] = 255
+        vertex["animation"] = -1
+        self.phases[index] = self.get_elapsed()
+        self.emitters.append(emitter)
+        self._indices[emitter] = index
+        self._changed = True
+
+    @beartype
+    def remove(self, emitter: Sprite) -> None:
+        """Stop the animation of the emitter, if any, by moving the last one over it."""
+        if (index := self._indices.pop(emitter, None)) is None:
+            return
+        last = self.emitters.pop()
+        if last is not emitter:
+            self.emitters[index] = last
+            self._indices[last] = index
+            self.vertices[index] = self.vertices[len(self.emitters)]
+            self.phases[index] = self.phases[len(self.emitters)]
+        self._changed = True
+
+    @beartype
+    def clear(self) -> None:
+        self.emitters.clear()
+        self._indices.clear()
+        self._changed = True
+
+    @beartype
+    def on_update(self) -> None:
+        """Select the current frame of every instance from the game clock."""
+        if not self.emitters:
+            return
+        if self._slots is None:
+            atlas = arcade.get_window().ctx.default_atlas
+            slots = {
+                frame: atlas.add(texture)[0] for frame, texture in self.textures.items()
+            }
+            self._slots = np.array([slots[frame] for frame in self.frames], np.float32)
+        count = len(self.emitters)
+        steps = (self.get_elapsed() - self.phases[:count]) // self.frame_time
+        textures = self._slots[steps.astype(np.int64) % len(self.frames)]
+        if not np.array_equal(textures, self.vertices["texture"][:count]):
+            self.vertices["texture"][:count] = textures
+            self._changed = True
+
+    @beartype
+    def draw(self) -> None:
+        if not self.emitters:
+            return
+        ctx = arcade.get_window().ctx
+        if self._slots is None:
+            self.on_update()
+        if self._changed:
+            data = self.vertices[: len(self.emitters)].tobytes()
+            if self._buffer is None or self._buffer.size < len(data):
+                self._buffer = ctx.buffer(reserve=self.vertices.nbytes)
+                self._geometry = ctx.geometry([describe_tile_vertices(self._buffer)])
+            self._buffer.write(data)
+            self._changed = False
+        atlas = ctx.default_atlas
+        ctx.enable(ctx.BLEND)  # type: ignore[no-untyped-call]
+        ctx.blend_func = ctx.BLEND_DEFAULT
+        atlas.texture.filter = ctx.LINEAR, ctx.LINEAR
+        program = ctx.sprite_list_program_cull
+        program["spritelist_color"] = 1.0, 1.0, 1.0, 1.0
+        atlas.texture.use(0)
+        atlas.use_uv_texture(1)
+        self._geometry.render(program, mode=ctx.POINTS, vertices=len(self.emitters))
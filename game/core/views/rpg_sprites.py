@@ -7,6 +7,8 @@ from beartype import beartype
 from ..constants import SPRITE_SIZE
 from ..models.base_player_inventory import PlayerInventoryInterface
 from ..models.sprite_state import Direction, PlayerState
+from .sounds import load_sound
+from .spritesheets import load_spritesheet
 
 
 class CharacterSprite(arcade.Sprite):
@@ -14,7 +16,7 @@ class CharacterSprite(arcade.Sprite):
     def __init__(self, sheet_name: str) -> None:
         super().__init__()
         self.state = PlayerState(state_name="Player")
-        self._textures = arcade.load_spritesheet(
+        self._textures = load_spritesheet(
             sheet_name,
             sprite_width=SPRITE_SIZE,
             sprite_height=SPRITE_SIZE,
@@ -76,7 +78,7 @@ class PlayerSprite(CharacterSprite):
     ) -> None:
         super().__init__(sheet_name)
         self.player_inventory = player_inventory
-        self._footstep_sound = arcade.load_sound(":sounds:footstep00.wav")
+        self._footstep_sound = load_sound(":sounds:footstep00.wav")
 
     @beartype
     def equip(self, item_name: str) -> bool:
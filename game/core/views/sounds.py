@@ -0,0 +1,23 @@
+"""Sounds decoded once per process.
+
+Every player sprite loads its footsteps, so the decoded sounds are shared by their
+resolved path instead of decoding the file for each sprite and each reload.
+
+"""
+
+from functools import lru_cache
+
+import arcade
+from arcade.resources import resolve_resource_path
+from beartype import beartype
+
+
+@lru_cache(maxsize=None)
+def _load_sound(file_name: str) -> arcade.Sound:
+    return arcade.Sound(file_name)
+
+
+@beartype
+def load_sound(file_name: str) -> arcade.Sound:
+    """Return the sound like `arcade.load_sound`, from cache."""
+    return _load_sound(str(resolve_resource_path(file_name)))
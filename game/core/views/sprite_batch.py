@@ -0,0 +1,56 @@
+"""Dynamic sprites packed in the shared texture atlas and drawn in one call.
+
+Every sprite list draws from the default atlas, so sprites from different owners can
+be batched as long as their textures are in it. Arcade grows the atlas when it is full
+and keeps the slot of every texture, so packing the textures in use at load time
+moves that work out of the first frame that shows them.
+
+"""
+
+from collections.abc import Iterable
+
+import arcade
+from arcade.sprite import Sprite
+from beartype import beartype
+
+
+@beartype
+def get_sprite_textures(sprite: Sprite) -> list[arcade.Texture]:
+    """Return the current texture and the animation frames of the sprite."""
+    textures = [sprite.texture] if sprite.texture else []
+    return textures + [*sprite.textures, *getattr(sprite, "_textures", [])]
+
+
+@beartype
+def pack_textures(
+    sprites: Iterable[Sprite], textures: Iterable[arcade.Texture] = ()
+) -> int:
+    """Add the textures of the sprites to the atlas and return how many were new."""
+    atlas = arcade.get_window().ctx.default_atlas
+    added = 0
+    for texture in [*textures, *(t for s in sprites for t in get_sprite_textures(s))]:
+        if not atlas.has_texture(texture):
+            atlas.add(texture)
+            added += 1
+    return added
+
+
+class SpriteBatch:
+    """Sprites from several owners drawn in one call, in the order last given."""
+
+    @beartype
+    def __init__(self) -> None:
+        self.sprite_list = arcade.SpriteList()
+
+    @beartype
+    def update(self, sprites: list[Sprite]) -> None:
+        """Rebuild the batch only when the sprites or their order changed."""
+        if len(sprites) != len(self.sprite_list) or any(
+            sprite is not batched for sprite, batched in zip(sprites, self.sprite_list)
+        ):
+            self.sprite_list.clear()
+            self.sprite_list.extend(sprites)
+
+    @beartype
+    def draw(self) -> None:
+        self.sprite_list.draw()  # type: ignore[no-untyped-call]
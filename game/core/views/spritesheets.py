@@ -0,0 +1,66 @@
+"""Spritesheets sliced once per process.
+
+Sprites are rebuilt when the player code is reloaded, so the frames of each sheet are
+cached by their file and geometry. Reusing the same textures also reuses their
+regions in the texture atlas instead of decoding and uploading the image again. The
+sheets are read from the asset cache when it was built.
+
+"""
+
+from functools import lru_cache
+
+import arcade
+from arcade.resources import resolve_resource_path
+from beartype import beartype
+
+from ..asset_cache import open_image
+
+
+@lru_cache(maxsize=None)
+def _slice_spritesheet(
+    file_name: str,
+    sprite_width: int,
+    sprite_height: int,
+    columns: int,
+    count: int,
+    margin: int,
+) -> tuple[arcade.Texture, ...]:
+    """Slice the frames like `arcade.load_spritesheet`, from the asset cache."""
+    source_image = open_image(file_name)
+    textures = []
+    for index in range(count):
+        left = (sprite_width + margin) * (index % columns)
+        top = (sprite_height + margin) * (index // columns)
+        # Arcade names the frames by file and index, which the atlas uses as the key
+        name = f"{file_name}-{sprite_width}x{sprite_height}-{columns}-{margin}-{index}"
+        textures.append(
+            arcade.Texture(
+                name,
+                image=source_image.crop(
+                    (left, top, left + sprite_width, top + sprite_height)
+                ),
+            )
+        )
+    return tuple(textures)
+
+
+@beartype
+def load_spritesheet(
+    file_name: str,
+    sprite_width: int,
+    sprite_height: int,
+    columns: int,
+    count: int,
+    margin: int = 0,
+) -> list[arcade.Texture]:
+    """Return the frames of the sheet like `arcade.load_spritesheet`, from cache."""
+    return list(
+        _slice_spritesheet(
+            str(resolve_resource_path(file_name)),
+            sprite_width,
+            sprite_height,
+            columns,
+            count,
+            margin,
+        )
+    )
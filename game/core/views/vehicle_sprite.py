@@ -7,6 +7,7 @@ from beartype import beartype
 
 from ..constants import SPRITE_SIZE
 from ..models.sprite_state import PlayerState, VehicleDirection
+from .spritesheets import load_spritesheet
 
 
 class VehicleType(Enum):
@@ -21,7 +22,7 @@ class VehicleSprite(arcade.Sprite):
         super().__init__()
         self.state = PlayerState(state_name=sheet_name)
         self.state.vehicle_direction = VehicleDirection.DOWN
-        self.textures = arcade.load_spritesheet(
+        self.textures = load_spritesheet(
             sheet_name,
             sprite_width=int(SPRITE_SIZE * 4.5),
             sprite_height=SPRITE_SIZE * 6,
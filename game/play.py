@@ -4,11 +4,17 @@ Run with `poetry run doit play`
 
 """
 
+from functools import partial
+
 import arcade
 from beartype import beartype
 
 from .core.game_view import GameView
+from .core.loading_view import LoadingView
+from .core.models.sprite_state import SPRITE_STATES
+from .core.save_worker import SAVE_WORKER
 from .core.settings import SETTINGS
+from .core.state_store import STATE_STORE
 from .tasks import code_modules, player_module, raft_module
 
 
@@ -20,11 +26,17 @@ def main() -> None:  # pragma: no cover
         title="Design Patterns Adventure!",
         center_window=True,
     )
-    game_view = GameView(
-        player_module=player_module, raft_module=raft_module, code_modules=code_modules
+    create_game_view = partial(
+        GameView,
+        player_module=player_module,
+        raft_module=raft_module,
+        code_modules=code_modules,
     )
-    window.show_view(game_view)
+    window.show_view(LoadingView(create_game_view))
     arcade.run()  # type: ignore[no-untyped-call]
+    SPRITE_STATES.flush()
+    SAVE_WORKER.flush()
+    STATE_STORE.commit()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,61 @@
+"""Compare the per-frame cost of the collision backends as blocking tiles grow.
+
+Run with: `poetry run python -m tests.benchmarks.bench_collision`
+
+"""
+
+import time
+
+import arcade
+import numpy as np
+
+from game.core.occupancy_grid import OccupancyGrid, OccupancyPhysicsEngine
+
+TILE = 32
+SIZE = 128
+FRAMES = 2000
+
+
+def _make_blocked(fraction: float) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    blocked = rng.random((SIZE, SIZE)) < fraction
+    blocked[60:68, 60:68] = False  # Room for the player to move
+    return blocked
+
+
+def _make_walls(blocked: np.ndarray) -> arcade.SpriteList:
+    walls = arcade.SpriteList(use_spatial_hash=True)
+    texture = arcade.make_soft_square_texture(TILE, arcade.color.GRAY, 255, 255)
+    for row, col in zip(*np.nonzero(blocked)):
+        wall = arcade.Sprite(texture=texture)
+        wall.position = (col * TILE + TILE / 2, row * TILE + TILE / 2)
+        walls.append(wall)
+    return walls
+
+
+def _time_frames(engine, player: arcade.Sprite) -> float:
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        player.change_x = 3 if (frame // 40) % 2 else -3
+        player.change_y = 3 if (frame // 60) % 2 else -3
+        engine.update()
+    return (time.perf_counter() - start) / FRAMES * 1e6
+
+
+def main() -> None:
+    print(f"{'blocked tiles':>14} {'sprites (us)':>14} {'grid (us)':>10}")
+    for fraction in (0.0, 0.1, 0.3, 0.6):
+        blocked = _make_blocked(fraction)
+        player = arcade.SpriteSolidColor(30, 30, arcade.color.RED)
+        player.position = (64 * TILE, 64 * TILE)
+        simple = arcade.PhysicsEngineSimple(player, _make_walls(blocked))
+        sprites_us = _time_frames(simple, player)
+
+        player.position = (64 * TILE, 64 * TILE)
+        grid = OccupancyPhysicsEngine(player, OccupancyGrid(blocked, (TILE, TILE)))
+        grid_us = _time_frames(grid, player)
+        print(f"{int(blocked.sum()):>14} {sprites_us:>14.1f} {grid_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Compare cold and warm startup of the map, loaded like the game state loads it.
+
+Run with: `poetry run python -m tests.benchmarks.bench_map_load`
+
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import arcade
+
+from game.core.constants import MAP
+from game.core.map_loader import load_map
+from game.core.models.map_delta import MapDelta
+
+
+def _time_load(cache_root: Path) -> float:
+    arcade.cleanup_texture_cache()
+    start = time.perf_counter()
+    load_map(MapDelta(), MAP, cache_root=cache_root)
+    return time.perf_counter() - start
+
+
+def main(repeat: int = 3) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_root = Path(tmp_dir)
+        print(f"cold (decode + arcade + compile): {_time_load(cache_root):.3f}s")
+        warm = min(_time_load(cache_root) for _ in range(repeat))
+        print(f"warm (cached arrays and scene):   {warm:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
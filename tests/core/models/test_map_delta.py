@@ -0,0 +1,69 @@
+import json
+
+from game.core.constants import MAP
+from game.core.models import MapDelta
+from game.core.models.map_delta import get_object_id
+from game.core.state_store import StateStore
+
+
+def _object_ids(tile_map, layer_name):
+    layer = next(_l for _l in tile_map["layers"] if _l["name"] == layer_name)
+    return {get_object_id(obj) for obj in layer["objects"]}
+
+
+def test_map_delta_replay(fix_test_cache):
+    store = StateStore(path=fix_test_cache / "save.sqlite3")
+    delta = MapDelta.load(store)
+    drop = {"id": 1, "gid": 1, "properties": [{"name": "id", "value": "drop-1"}]}
+
+    delta.record_removal("interactables_blocking", "1f3puldm")
+    delta.record_drop("searchable", drop, (10, 20))
+    delta.record_tileset({"firstgid": 5000, "source": "Wood.json"})
+    delta.record_removal("searchable", "5iibnbnr")
+    store.close()
+
+    loaded = MapDelta.load(StateStore(path=store.path))
+    assert len(loaded.removed_ids) == 2
+    tile_map = json.loads(MAP.read_text())
+    loaded.replay(tile_map)
+    assert "1f3puldm" not in _object_ids(tile_map, "interactables_blocking")
+    assert _object_ids(tile_map, "searchable") == {"lut73nt9", "chest123", "drop-1"}
+    assert tile_map["tilesets"][-1]["source"] == "Wood.json"
+    assert [_d["center"] for _d in loaded.live_drops] == [[10, 20]]
+
+
+def test_map_delta_from_legacy_save(fix_test_cache):
+    pristine = json.loads(MAP.read_text())
+    saved = json.loads(MAP.read_text())
+    searchable = next(_l for _l in saved["layers"] if _l["name"] == "searchable")
+    searchable["objects"] = [
+        obj for obj in searchable["objects"] if get_object_id(obj) != "lut73nt9"
+    ]
+    store = StateStore(path=fix_test_cache / "save.sqlite3")
+
+    result = MapDelta.from_legacy_save(pristine, saved, store=store)
+
+    assert result.removed_ids == {"lut73nt9"}
+    assert not result.drops
+    assert store.map_records == [
+        {"op": "remove", "layer": "searchable", "id": "lut73nt9"}
+    ]
+
+
+def test_map_delta_shares_duplicate_tilesets(fix_test_cache):
+    store = StateStore(path=fix_test_cache / "save.sqlite3")
+    delta = MapDelta.load(store)
+    for idx, first_gid in enumerate([5000, 5001]):
+        delta.record_tileset({"firstgid": first_gid, "source": "Wood.json"})
+        props = [{"name": "id", "value": f"drop-{idx}"}]
+        delta.record_drop(
+            "searchable", {"id": idx, "gid": first_gid, "properties": props}, (0, 0)
+        )
+
+    tile_map = json.loads(MAP.read_text())
+    delta.replay(tile_map)
+
+    sources = [_t.get("source") for _t in tile_map["tilesets"]]
+    assert sources.count("Wood.json") == 1
+    layer = next(_l for _l in tile_map["layers"] if _l["name"] == "searchable")
+    assert {obj["gid"] for obj in layer["objects"][-2:]} == {5000}
@@ -0,0 +1,29 @@
+import json
+
+from game.core.constants import MAP
+from game.core.models.object_index import MapObjectIndex
+
+
+def test_map_object_index():
+    tile_map = json.loads(MAP.read_text())
+    index = MapObjectIndex(tile_map)
+
+    assert len(index["searchable"]) == 3
+    assert index["interactables_blocking"].pop("1f3puldm")["name"] == "Tree"
+    assert index["interactables_blocking"].pop("1f3puldm") is None
+    assert index.allocate_object_id() == tile_map["nextobjectid"]
+    assert index.allocate_object_id() == tile_map["nextobjectid"] + 1
+    first_gid = index.allocate_gids(index.get_tile_count("Wood.json"))
+    assert first_gid == 4734  # One past the last tile of 'Rope.json'
+    assert index.allocate_gids() == first_gid + 1
+
+
+def test_map_object_index_shares_tilesets():
+    tile_map = json.loads(MAP.read_text())
+    index = MapObjectIndex(tile_map)
+
+    assert index.add_tileset("Rope.json") is None
+    wood = index.add_tileset("Wood.json")
+    assert wood == {"firstgid": 4734, "source": "Wood.json"}
+    assert index.add_tileset("Wood.json") is None
+    assert index.first_gids["Wood.json"] == 4734
@@ -0,0 +1,25 @@
+from game.core.models import SpriteState
+from game.core.models.sprite_state import SpriteStateBatch
+from game.core.state_store import StateStore
+
+
+def test_sprite_state_batch(fix_test_cache):
+    store = StateStore(path=fix_test_cache / "save.sqlite3")
+    batch = SpriteStateBatch(interval=1.0, store=store)
+    state = SpriteState(state_name="test batch", sprite_resource="N/A")
+
+    for _idx in range(60):
+        state.center_x += 1
+        batch.mark_dirty(state)
+        batch.on_update(1 / 120)
+    assert batch.is_dirty
+    assert not store.is_dirty
+
+    batch.on_update(0.5)
+    assert store.get_sprite_state("test batch") == state.json()
+    store.commit()
+    batch.mark_dirty(state)
+    batch.flush()  # Unchanged since the last flush
+
+    assert not batch.is_dirty
+    assert not store.is_dirty
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import arcade
+import numpy as np
+import pytest
+from PIL import Image
+
+from game.core.asset_cache import (
+    build_asset_cache,
+    get_asset_keys,
+    get_used_regions,
+    install_texture_cache,
+    load_asset_cache,
+)
+
+BASE_CHIP = "game/assets/maps/[Base]BaseChip_pipo.png"
+CHARACTER = "game/assets/characters/Male/Male 01-1.png"
+
+
+def test_asset_cache(fix_test_cache: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    index = build_asset_cache(cache_dir=fix_test_cache)
+
+    # Only the rows of the tileset up to the last referenced tile are kept
+    assert index["images"][BASE_CHIP]["size"] == [256, 3456]
+    asset_cache = load_asset_cache(fix_test_cache)
+    assert asset_cache
+    x, y, width, height = get_used_regions()[BASE_CHIP][-1]
+    image = asset_cache.get_image(BASE_CHIP)
+    expected = np.asarray(Image.open(BASE_CHIP).convert("RGBA"))
+    region = np.s_[y : y + height, x : x + width]
+    assert np.array_equal(np.asarray(image)[region], expected[region])
+    assert np.array_equal(
+        np.asarray(asset_cache.get_image(CHARACTER)),
+        np.asarray(Image.open(CHARACTER).convert("RGBA")),
+    )
+    monkeypatch.setattr(arcade.load_texture, "texture_cache", {})
+    assert install_texture_cache(asset_cache) == len(index["images"])
+    assert arcade.load_texture.texture_cache[CHARACTER].image.size == (96, 128)
+
+    # Images that changed since the build are decoded again
+    asset_cache.images[CHARACTER]["stamps"][0][2] += 1
+    assert asset_cache.get_image(CHARACTER) is None
+
+
+def test_get_asset_keys() -> None:
+    keys = get_asset_keys()
+
+    assert BASE_CHIP in keys
+    assert "game/assets/raft.png" in keys
+    # Character sheets are loaded when the task code picks them
+    assert CHARACTER not in keys
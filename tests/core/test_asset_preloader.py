@@ -0,0 +1,24 @@
+import arcade
+import pytest
+
+from game.core.asset_cache import add_resource_handles
+from game.core.asset_preloader import AssetPreloader
+
+CHARACTER = "game/assets/characters/Male/Male 01-1.png"
+
+
+def test_asset_preloader(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(arcade.load_texture, "texture_cache", {})
+    add_resource_handles()
+    preloader = AssetPreloader(
+        images=[CHARACTER, "game/assets/missing.png"],
+        sounds=["game/assets/sounds/footstep00.wav"],
+    )
+    preloader.wait()
+
+    assert preloader.finished
+    assert preloader.poll() == 1
+    assert ":characters:Male/Male 01-1.png" in arcade.load_texture.texture_cache
+    texture = arcade.load_texture(":characters:Male/Male 01-1.png", 0, 0, 32, 32)
+    assert texture.image.size == (32, 32)
+    assert "game/assets/missing.png" not in arcade.load_texture.texture_cache
@@ -0,0 +1,25 @@
+import numpy as np
+
+from game.core.coast_distance import compute_nearest_land, load_coast_distance
+
+
+def test_nearest_land(fix_test_cache):
+    land = np.zeros((5, 8), dtype=np.bool_)
+    land[:, 0] = True  # Shore on the left edge
+    land[4, 7] = True  # Island in the top right corner
+
+    nearest, distance = compute_nearest_land(land)
+
+    assert tuple(nearest[2, 3]) == (2, 0)
+    assert distance[2, 3] == 3
+    assert tuple(nearest[3, 6]) == (4, 7)
+    assert distance[0, 0] == 0
+    field = load_coast_distance(land, (32, 32), "map", cache_root=fix_test_cache)
+    assert field.nearest_land(32 * 3 + 16, 32 * 2 + 16) == ((16, 80), 96)
+    assert field.is_near_land(48, 16, reach=16)
+    assert not field.is_near_land(32 * 3 + 16, 16, reach=16)
+    assert field.nearest_land(-1, 0) is None
+    cached = load_coast_distance(land, (32, 32), "map", cache_root=fix_test_cache)
+    assert (cached.distance == field.distance).all()
+    _, no_land = compute_nearest_land(np.zeros((2, 2), dtype=np.bool_))
+    assert np.isinf(no_land).all()
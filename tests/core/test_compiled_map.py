@@ -0,0 +1,27 @@
+from game.core.compiled_map import (
+    CompiledTileMap,
+    get_compiled_map_path,
+    load_compiled_tilemap,
+)
+from game.core.constants import MAP
+
+LAYER_OPTIONS = {"trees_blocking": {"use_spatial_hash": True}}
+
+
+def test_load_compiled_tilemap(fix_test_cache):
+    tile_map = load_compiled_tilemap(MAP, LAYER_OPTIONS, cache_root=fix_test_cache)
+    compiled = load_compiled_tilemap(MAP, LAYER_OPTIONS, cache_root=fix_test_cache)
+
+    assert get_compiled_map_path(MAP, LAYER_OPTIONS, fix_test_cache).is_file()
+    assert isinstance(compiled, CompiledTileMap)
+    assert (compiled.width, compiled.height) == (tile_map.width, tile_map.height)
+    assert [*compiled.sprite_lists] == [*tile_map.sprite_lists]
+    for name, sprite_list in tile_map.sprite_lists.items():
+        restored = compiled.sprite_lists[name]
+        assert [_s.position for _s in restored] == [_s.position for _s in sprite_list]
+        assert [_s.properties for _s in restored] == [
+            _s.properties for _s in sprite_list
+        ]
+        assert restored.use_spatial_hash == sprite_list.use_spatial_hash, name
+    trees = compiled.sprite_lists["trees_blocking"]
+    assert trees.spatial_hash.get_objects_for_point(trees[0].position)
@@ -0,0 +1,46 @@
+import arcade
+import numpy as np
+
+from game.core.asset_cache import add_resource_handles
+from game.core.game_clock import GameClock
+from game.core.game_map import GameMap
+from game.core.game_state import GameState
+
+
+def test_collision_profiles(window):
+    add_resource_handles()
+    game_map = GameMap(GameState(), GameClock())
+
+    game_map.move_on_water()
+    water = game_map.grid
+    game_map.move_on_land()
+
+    assert game_map.collision_profile == "land"
+    assert game_map.grid is game_map.occupancy_grids["land"]
+    # The raft docks next to the cells that block it but not the player
+    dockable = (water.counts > 0) & (game_map.grid.counts == 0)
+    row, column = np.argwhere(dockable)[0]
+    sprite = arcade.Sprite(center_x=(column + 0.5) * 32, center_y=(row + 0.5) * 32)
+    assert game_map.closest_land_coordinates(sprite) == (sprite.position, 0)
+    game_map.move_on_water()
+    assert game_map.grid is water
+
+
+def test_occupancy_grids(window):
+    add_resource_handles()
+    game_map = GameMap(GameState(), GameClock())
+    tree = game_map.map_layers["interactables_blocking"][0]
+    box = (tree.left, tree.bottom, tree.right, tree.top)
+
+    game_map.move_on_land()
+    assert game_map.grid.is_blocked(*box)
+    assert not game_map.grid.is_blocked(3584, 584, 3616, 616)  # Starting position
+    assert game_map.grid.is_blocked(-32, 600, 0, 632)
+    blocked_cells = game_map.grid.counts.sum()
+    assert tree in game_map.spatial_index.in_rect("interactables_blocking", *box)
+    game_map.update_view(3000, 300, 1280, 720)
+    counts = game_map.draw_counts
+    assert counts["interactables_blocking"][0] >= 1
+    assert sum(counts["ground"]) > counts["ground"][0] > 0  # Chunks out of view
+    game_map.update_occupancy("interactables_blocking", tree, removed=True)
+    assert game_map.grid.counts.sum() < blocked_cells
@@ -0,0 +1,60 @@
+import arcade
+import numpy as np
+
+from game.core.map_chunks import BakedChunk, MapChunks
+from game.core.tile_layers import TileLayers
+
+
+def test_map_chunks(window):
+    image = str(
+        arcade.resources.resolve_resource_path(":resources:images/tiles/grassMid.png")
+    )
+    tilesets = [
+        {
+            "firstgid": 1,
+            "image": image,
+            "columns": 1,
+            "tilewidth": 128,
+            "tileheight": 128,
+            "margin": 0,
+            "spacing": 0,
+            "tiles": {},
+            "animations": {},
+        }
+    ]
+    gids = np.ones((32, 32), dtype=np.uint32)
+    tile_layers = TileLayers({"ground": gids}, (32, 32), "test", tilesets=tilesets)
+    chunks = MapChunks(tile_layers, ["ground"], chunk_tiles=4, budget=9)
+
+    chunks.update(0, 0, 100, 100)
+    assert sorted(chunks.loaded) == [(col, row) for col in range(2) for row in range(2)]
+    assert chunks.loaded[(0, 0)][0].count == 16
+    chunks.update(512, 512, 100, 100)
+    assert len(chunks.loaded) == 9
+    assert (0, 0) not in chunks.loaded  # Least recently used
+    assert (4, 4) in chunks.visible
+    assert chunks.counts["ground"] == (1, 63)
+    chunks.draw()
+    baked = MapChunks(tile_layers, ["ground"], chunk_tiles=4, static_layers=["ground"])
+    assert baked.overhang == (3, 3)  # The tiles are larger than their cells
+    baked.update(0, 0, 100, 100)
+    assert isinstance(baked.loaded[(0, 0)][0], BakedChunk)
+    baked.draw()
+    tilesets[0]["animations"] = {"0": [[0, 100]]}
+    animated = MapChunks(tile_layers, ["ground"], static_layers=["ground"])
+    assert animated.passes == [(False, ["ground"])]
+
+
+def test_baked_chunk_premultiplies_alpha(window):
+    sprite = arcade.SpriteSolidColor(32, 32, arcade.color.WHITE)
+    sprite.position = (80, 16)
+    sprite.alpha = 128
+    sprite_list = arcade.SpriteList()
+    sprite_list.append(sprite)
+
+    baked = BakedChunk(window.ctx, (64, 0, 64, 64), [sprite_list])
+
+    pixels = np.frombuffer(baked.texture.read(), dtype=np.uint8).reshape(64, 64, 4)
+    assert abs(int(pixels[0, 0, 0]) - 128) <= 1
+    assert abs(int(pixels[0, 0, 3]) - 128) <= 1
+    assert not pixels[63, 63].any()
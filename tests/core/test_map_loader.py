@@ -0,0 +1,36 @@
+import json
+
+import arcade
+import numpy as np
+import pytiled_parser
+
+from game.core.compiled_map import CompiledTileMap
+from game.core.constants import MAP
+from game.core.map_loader import load_map, parse_tiled_map
+from game.core.models import MapDelta
+from game.core.state_store import StateStore
+
+
+def test_parse_tiled_map_matches_pytiled_parser():
+    expected = pytiled_parser.parse_map(MAP)
+
+    result = parse_tiled_map(json.loads(MAP.read_text()), MAP)
+
+    assert result == expected
+
+
+def test_load_map(fix_test_cache):
+    map_delta = MapDelta.load(StateStore(path=fix_test_cache / "save.sqlite3"))
+    map_delta.record_removal("searchable", "5iibnbnr")
+
+    loaded = load_map(map_delta, cache_root=fix_test_cache)
+
+    assert isinstance(loaded.scene_map, arcade.TileMap)
+    assert "ground" not in loaded.scene_map.sprite_lists  # Drawn from the gids
+    assert len(loaded.scene_map.sprite_lists["searchable"]) == 3
+    assert loaded.map_objects["searchable"].get("5iibnbnr") is None
+    assert loaded.tile_layers.shape == (128, 128)
+    cached = load_map(map_delta, cache_root=fix_test_cache)
+    assert isinstance(cached.scene_map, CompiledTileMap)
+    assert "ground" not in cached.scene_map.sprite_lists
+    assert np.count_nonzero(cached.tile_layers["ground"]) == 7223
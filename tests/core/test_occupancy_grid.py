@@ -0,0 +1,44 @@
+import arcade
+import numpy as np
+
+from game.core.occupancy_grid import OccupancyGrid, OccupancyPhysicsEngine
+
+
+def test_occupancy_physics_engine_slides_along_walls():
+    blocked = np.zeros((4, 4), dtype=np.bool_)
+    blocked[:, 2] = True  # Wall in the third column
+    grid = OccupancyGrid(blocked, (32, 32))
+    player = arcade.SpriteSolidColor(30, 30, arcade.color.RED)
+    player.position = (32 + 15, 32 + 15)
+    engine = OccupancyPhysicsEngine(player, grid)
+
+    player.change_x, player.change_y = 3, 3
+
+    assert engine.update() == ["x"]
+    assert player.position == (47, 50)
+    player.position = (15, 15)
+    player.change_x, player.change_y = -3, 0
+    assert engine.update() == ["x"]  # Leaving the map is blocked
+    grid.add_sprite(player)
+    assert grid.is_blocked(0, 0, 10, 10)
+    grid.remove_sprite(player)
+    assert not grid.is_blocked(0, 0, 10, 10)
+
+
+def test_occupancy_physics_engine_leaves_walls_it_starts_in():
+    blocked = np.zeros((4, 14), dtype=np.bool_)
+    blocked[:, 1:11] = True  # Ten wall columns
+    grid = OccupancyGrid(blocked, (32, 32))
+    player = arcade.SpriteSolidColor(30, 30, arcade.color.RED)
+    player.position = (32, 47)  # Overlapping the first wall column
+    engine = OccupancyPhysicsEngine(player, grid)
+
+    player.change_x, player.change_y = 3, 0
+    for _ in range(200):
+        engine.update()
+    assert player.right <= 64  # Never further into the walls
+
+    player.change_x = -3
+    for _ in range(20):
+        engine.update()
+    assert not grid.is_blocked(player.left, player.bottom, player.right, player.top)
@@ -0,0 +1,25 @@
+import arcade
+
+from game.core.game_clock import GameClock
+from game.core.views.particles import ParticleEmitters
+
+
+def test_particle_emitters(window):
+    game_clock = GameClock()
+    sparkles = ParticleEmitters(game_clock, "sparkle", capacity=2)
+    emitters = [arcade.Sprite(center_x=index * 32, center_y=16) for index in range(3)]
+    for emitter in emitters:
+        sparkles.add(emitter)
+
+    sparkles.remove(emitters[0])
+    assert sparkles.emitters == [emitters[2], emitters[1]]
+    assert list(sparkles.vertices["position"][0]) == [64, 16]
+    sparkles.on_update()
+    first = sparkles.vertices["texture"][0]
+    game_clock.on_update(0.25)
+    sparkles.add(emitters[0])
+    sparkles.on_update()
+    textures = sparkles.vertices["texture"][:3]
+    assert textures[0] == textures[1] != first
+    assert textures[2] == first  # Starts on the first frame
+    sparkles.draw()
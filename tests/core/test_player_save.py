@@ -0,0 +1,81 @@
+import arcade
+import PIL.Image
+
+from game.core.player_save import (
+    TextureStore,
+    decode_player_data,
+    encode_player_data,
+    is_binary_save,
+)
+from game.core.state_store import StateStore
+from game.core.views.vehicle_sprite import VehicleType
+
+
+def _item(name, color, **properties):
+    image = PIL.Image.new("RGBA", (16, 16), color)
+    sprite = arcade.Sprite(texture=arcade.Texture(name=f"test-{name}", image=image))
+    sprite.properties = {"name": name, "count": 2, **properties}
+    return sprite
+
+
+def test_player_save_round_trip(fix_test_cache):
+    state_store = StateStore(path=fix_test_cache / "save.sqlite3")
+    store = TextureStore(state_store)
+    inventory = [_item("Wood", "brown"), _item("Pickaxe", "gray", equippable=True)]
+    data = {
+        "x": 1.5,
+        "y": 2.5,
+        "item": inventory[1],
+        "vehicle_type": VehicleType.RAFT,
+        "vehicle_x": None,
+        "vehicle_y": 4.0,
+        "vehicle_docked": True,
+    }
+
+    raw = encode_player_data(data, inventory, texture_store=store)
+    state_store.set_player(raw)
+    state_store.commit()
+    result = decode_player_data(raw)
+
+    assert is_binary_save(raw)
+    assert encode_player_data(data, inventory, texture_store=store) == raw
+    # The textures are committed in the same transaction as the player
+    assert (
+        state_store.connection.execute("SELECT COUNT(*) FROM textures").fetchone()[0]
+        == 2
+    )
+    assert result["item"]["name"] == "Pickaxe"
+    assert result["item"]["equippable"]
+    assert [_i["count"] for _i in result["inventory"]] == [2, 2]
+    assert (result["vehicle_type"], result["vehicle_x"]) == (VehicleType.RAFT, None)
+    loaded = TextureStore(StateStore(path=state_store.path))
+    texture = loaded.get(result["inventory"][0]["digest"])
+    assert loaded.get(result["inventory"][0]["digest"]) is texture
+    assert texture.image.getpixel((0, 0)) == inventory[0].texture.image.getpixel((0, 0))
+
+
+def test_texture_store_saves_again_after_clear(fix_test_cache):
+    state_store = StateStore(path=fix_test_cache / "save.sqlite3")
+    store = TextureStore(state_store)
+    inventory = [_item("Wood", "brown")]
+    data = {
+        "x": 0.0,
+        "y": 0.0,
+        "item": None,
+        "vehicle_type": None,
+        "vehicle_x": None,
+        "vehicle_y": None,
+        "vehicle_docked": False,
+    }
+    state_store.set_player(encode_player_data(data, inventory, texture_store=store))
+    state_store.commit()
+
+    state_store.clear()
+    store.clear()
+    state_store.set_player(encode_player_data(data, inventory, texture_store=store))
+    state_store.close()
+
+    reopened = StateStore(path=state_store.path)
+    digest = decode_player_data(reopened.get_player())["inventory"][0]["digest"]
+    texture = TextureStore(reopened).get(digest)
+    assert texture.image.size == (16, 16)
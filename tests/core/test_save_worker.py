@@ -0,0 +1,21 @@
+from threading import Event
+
+from game.core.save_worker import SaveWorker
+
+
+def test_save_worker_runs_latest_task():
+    worker = SaveWorker()
+    release = Event()
+    saved = []
+
+    def hold():
+        release.wait(timeout=5)
+
+    worker.submit("other", hold)
+    for idx in range(50):
+        worker.submit("player", lambda idx=idx: saved.append(idx))
+    release.set()
+    worker.flush()
+
+    # Tasks of a key that were queued before the thread got to them are coalesced
+    assert saved == [49]
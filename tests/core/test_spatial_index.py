@@ -0,0 +1,31 @@
+import arcade
+
+from game.core.spatial_index import SpatialIndex
+
+
+def make_sprite(x, y):
+    sprite = arcade.SpriteSolidColor(32, 32, arcade.color.RED)
+    sprite.position = (x, y)
+    return sprite
+
+
+def test_spatial_index(window):
+    index = SpatialIndex(1024, 1024, cell_size=64)
+    near, far, other = make_sprite(100, 100), make_sprite(900, 900), make_sprite(0, 0)
+    for sprite in (near, far):
+        index.insert("searchable", sprite)
+    index.insert("interactables_blocking", other)
+
+    assert index.in_rect("searchable", 90, 90, 110, 110) == [near]
+    assert index.in_radius("searchable", 100, 140, 40) == [near]
+    assert index.nearest("searchable", 800, 800, count=2) == [
+        (far, 100 * 2**0.5),
+        (near, 700 * 2**0.5),
+    ]
+    assert not index.nearest("searchable", 500, 500, max_distance=100)
+    index.remove("searchable", far)
+    assert index.nearest("searchable", 800, 800)[0][0] is near
+    near.position = (500, 500)
+    index.insert("searchable", near)
+    assert index.in_rect("searchable", 90, 90, 110, 110) == []
+    assert len(index) == 2
@@ -0,0 +1,26 @@
+import arcade
+
+from game.core.views.sprite_batch import SpriteBatch, pack_textures
+
+
+def test_sprite_batch(window):
+    textures = [
+        arcade.Texture(
+            f"batch-{index}",
+            image=arcade.make_soft_circle_texture(8, arcade.color.RED).image,
+        )
+        for index in range(2)
+    ]
+    sprites = [arcade.Sprite(texture=texture) for texture in textures]
+    batch = SpriteBatch()
+
+    assert pack_textures(sprites) == 2
+    assert pack_textures(sprites) == 0  # Already in the atlas
+    batch.update(sprites)
+    sprite_list = batch.sprite_list
+    batch.update([*sprites])
+    assert batch.sprite_list is sprite_list
+    assert [*batch.sprite_list] == sprites
+    batch.update(sprites[::-1])
+    assert [*batch.sprite_list] == sprites[::-1]
+    batch.draw()
@@ -0,0 +1,19 @@
+from game.core.views.spritesheets import load_spritesheet
+
+SHEET = "game/assets/characters/Male/Male 01-1.png"
+
+
+def test_load_spritesheet():
+    textures = load_spritesheet(
+        SHEET, sprite_width=32, sprite_height=32, columns=3, count=12
+    )
+    cached = load_spritesheet(
+        SHEET, sprite_width=32, sprite_height=32, columns=3, count=12
+    )
+    halves = load_spritesheet(
+        SHEET, sprite_width=16, sprite_height=16, columns=6, count=12
+    )
+
+    assert cached is not textures  # Callers can slice or edit their own list
+    assert all(frame is texture for frame, texture in zip(cached, textures))
+    assert textures[0].name != halves[0].name
@@ -0,0 +1,45 @@
+import json
+
+from game.core.save_worker import SAVE_WORKER
+from game.core.state_store import StateStore
+
+
+def test_state_store_round_trip(fix_test_cache):
+    path = fix_test_cache / "save.sqlite3"
+    store = StateStore(path=path)
+    store.set_player(b"first")
+    store.set_player(b"latest")
+    store.append_map_record({"op": "remove", "layer": "searchable", "id": "a"})
+    store.set_sprite_state("familiar", json.dumps({"center_x": 1}))
+    store.commit()
+    store.set_sprite_state("familiar", json.dumps({"center_x": 2}))
+    store.close()
+
+    loaded = StateStore(path=path)
+
+    assert loaded.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert loaded.get_player() == b"latest"
+    assert loaded.map_records == [{"op": "remove", "layer": "searchable", "id": "a"}]
+    assert json.loads(loaded.get_sprite_state("familiar")) == {"center_x": 2}
+    loaded.clear()
+    cleared = StateStore(path=path)
+    assert cleared.get_player() is None
+    assert not cleared.map_records
+    assert cleared.get_sprite_state("familiar") is None
+
+
+def test_state_store_commits_in_background(fix_test_cache):
+    path = fix_test_cache / "save.sqlite3"
+    store = StateStore(path=path)
+    store.set_texture(b"digest", b"png")
+    store.set_player(b"player")
+    store.commit_in_background()
+    store.append_map_record({"op": "remove", "layer": "searchable", "id": "b"})
+    store.commit_in_background()
+
+    assert store.get_texture(b"digest") == b"png"
+    SAVE_WORKER.flush()
+    loaded = StateStore(path=path)
+    assert loaded.get_player() == b"player"
+    assert loaded.get_texture(b"digest") == b"png"
+    assert loaded.map_records == [{"op": "remove", "layer": "searchable", "id": "b"}]
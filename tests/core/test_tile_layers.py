@@ -0,0 +1,72 @@
+import json
+from shutil import copy2, copytree, rmtree
+
+import numpy as np
+import pytest
+
+from game.core.constants import ASSETS_DIR, MAP
+from game.core.tile_layers import (
+    TILE_LAYERS_VERSION,
+    decode_layer,
+    get_map_hash,
+    load_tile_layers,
+)
+
+
+def test_load_tile_layers(fix_test_cache):
+    decoded = load_tile_layers(MAP, cache_root=fix_test_cache)
+    cached = load_tile_layers(MAP, cache_root=fix_test_cache)
+
+    assert [*cached.layers][:3] == ["ground", "coast_background", "water_blocking"]
+    assert cached.shape == (128, 128)
+    assert cached.tile_size == (32, 32)
+    assert isinstance(cached["ground"], np.memmap)
+    for name, gids in decoded.layers.items():
+        assert np.array_equal(gids, cached[name]), name
+    mask = cached.occupied(["ground", "water_blocking"])
+    assert mask.sum() == np.count_nonzero(cached["ground"] | cached["water_blocking"])
+
+
+def test_decode_unknown_compression():
+    layer = {"name": "ground", "data": "", "compression": "zstd"}
+    with pytest.raises(ValueError, match="ground"):
+        decode_layer(layer)
+
+
+def test_stale_caches_are_pruned(fix_test_cache):
+    (fix_test_cache / "old_map_hash" / "tile_layers-v1").mkdir(parents=True)
+    tile_layers = load_tile_layers(MAP, cache_root=fix_test_cache)
+    map_dir = fix_test_cache / tile_layers.map_hash
+    (map_dir / "tile_layers-v1").mkdir()
+    (map_dir / "scene-v1-2.6.16-0.pickle").touch()
+
+    rmtree(map_dir / f"tile_layers-v{TILE_LAYERS_VERSION}")
+    load_tile_layers(MAP, cache_root=fix_test_cache)
+
+    assert [path.name for path in fix_test_cache.iterdir()] == [map_dir.name]
+    assert sorted(path.name for path in map_dir.iterdir()) == [
+        "scene-v1-2.6.16-0.pickle",
+        f"tile_layers-v{TILE_LAYERS_VERSION}",
+    ]
+
+
+def test_tileset_edit_invalidates_cache(fix_test_cache):
+    assets_dir = fix_test_cache / "assets"
+    copytree(MAP.parent, assets_dir / "maps")
+    copy2(ASSETS_DIR / "Rope.png", assets_dir)
+    map_path = assets_dir / "maps" / MAP.name
+    cache_root = fix_test_cache / "cache"
+    tile_layers = load_tile_layers(map_path, cache_root=cache_root)
+    water_gid = 1065
+    assert not tile_layers.get_animation(water_gid)
+
+    tileset_path = assets_dir / "maps" / "[A]Water_pipo.json"
+    tileset = json.loads(tileset_path.read_text())
+    frames = [{"tileid": 0, "duration": 250}, {"tileid": 1, "duration": 250}]
+    tileset["tiles"] = [{"id": 0, "animation": frames}]
+    tileset_path.write_text(json.dumps(tileset))
+    edited = load_tile_layers(map_path, cache_root=cache_root)
+
+    assert edited.map_hash == get_map_hash(map_path) != tile_layers.map_hash
+    assert edited.get_animation(water_gid) == [(water_gid, 250), (water_gid + 1, 250)]
+    assert [path.name for path in cache_root.iterdir()] == [edited.map_hash]
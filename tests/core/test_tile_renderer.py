@@ -0,0 +1,70 @@
+import arcade
+import numpy as np
+
+from game.core.constants import MAP
+from game.core.tile_layers import TileLayers, load_tile_layers
+from game.core.tile_renderer import TileAtlas, TileGeometry, build_tile_vertices
+
+
+def test_build_tile_vertices_matches_arcade(window, fix_test_cache):
+    tile_layers = load_tile_layers(MAP, cache_root=fix_test_cache)
+    tile_map = arcade.load_tilemap(MAP, scaling=1)
+    rows, columns = tile_layers.shape
+    tile_atlas = TileAtlas(tile_layers)
+
+    for name in ("ground", "trees_blocking"):
+        vertices = build_tile_vertices(tile_atlas, [name], (0, rows), (0, columns))
+        sprites = tile_map.sprite_lists[name]
+        expected = np.array(
+            [(*sprite.position, sprite.width, sprite.height) for sprite in sprites]
+        )
+        assert np.allclose(vertices["position"], expected[:, :2]), name
+        assert np.allclose(vertices["size"], expected[:, 2:]), name
+        gids = tile_layers[name][np.nonzero(tile_layers[name])]
+        for gid, index in zip(*np.unique(gids, return_index=True)):
+            texture = arcade.load_texture(*tile_layers.get_tile_image(int(gid)))
+            assert texture.image == sprites[int(index)].texture.image, (name, gid)
+
+
+def test_animated_tiles(window):
+    images = [
+        str(arcade.resources.resolve_resource_path(f":resources:images/tiles/{name}"))
+        for name in ("grassMid.png", "stoneMid.png")
+    ]
+    tileset = {
+        "firstgid": 1,
+        "image": None,
+        "columns": 1,
+        "tilewidth": 128,
+        "tileheight": 128,
+        "margin": 0,
+        "spacing": 0,
+        "tiles": {
+            str(index): {"image": image, "width": 128, "height": 128}
+            for index, image in enumerate(images)
+        },
+        "animations": {"2": [[0, 100], [1, 100]]},
+    }
+    gids = np.array([[1, 2, 3]], dtype=np.uint32)
+    tile_layers = TileLayers({"water": gids}, (128, 128), "test", tilesets=[tileset])
+    tile_atlas = TileAtlas(tile_layers)
+    vertices = build_tile_vertices(tile_atlas, ["water"], (0, 1), (0, 3))
+    geometry = TileGeometry(window.ctx, vertices, tile_atlas)
+    framebuffer = window.ctx.framebuffer(
+        color_attachments=[window.ctx.texture((384, 128), components=4)]
+    )
+
+    def render(time: int) -> list[bytes]:
+        with framebuffer.activate():
+            window.ctx.projection_2d = (0, 384, 0, 128)
+            framebuffer.clear()
+            geometry.draw(time=time)
+        pixels = np.frombuffer(framebuffer.read(components=4), dtype=np.uint8)
+        tiles = pixels.reshape(128, 3, 128, 4)
+        return [tiles[:, index].tobytes() for index in range(3)]
+
+    assert list(vertices["animation"]) == [-1, -1, 0]
+    grass, stone, first = render(50)
+    assert first == grass != stone
+    assert render(150)[2] == stone
+    assert render(250)[2] == grass  # Loops after the total duration
@@ -0,0 +1,24 @@
+import arcade
+
+from game.core.spatial_index import SpatialIndex
+from game.core.view_culling import ViewCuller
+
+
+def test_view_culler(window):
+    index = SpatialIndex(2048, 2048)
+    sprites = []
+    for x in (1500, 100, 150):
+        sprite = arcade.SpriteSolidColor(32, 32, arcade.color.RED)
+        sprite.position = (x, 100)
+        index.insert("trees", sprite)
+        sprites.append(sprite)
+    culler = ViewCuller(index, ["trees"], margin=0)
+    culler.set_order(sprites)
+
+    culler.update(0, 0, 640, 360)
+
+    assert [*culler.sprite_lists["trees"]] == sprites[1:]
+    assert culler.counts == {"trees": (2, 1)}
+    culler.draw()
+    culler.update(1000, 0, 640, 360)
+    assert [*culler.sprite_lists["trees"]] == sprites[:1]